@@ -1,12 +1,15 @@
 import asyncio
 import logging
+from aiohttp import web
 from aiogram import Bot, Dispatcher
 from aiogram.enums import ParseMode
 from aiogram.client.default import DefaultBotProperties
+from aiogram.webhook.aiohttp_server import SimpleRequestHandler, setup_application
 from middlewares.message_logging import MessageLoggingMiddleware
 from config.config_manager import ConfigManager
 from commands import basic_router, monitor_router
-from commands.bot_instance import set_bot_instance
+from commands.bot_instance import create_bot_session, set_bot_instance
+from handlers.exchange_handlers import exchange_service, price_streams
 
 # Configure logging with more detail
 logging.basicConfig(
@@ -20,9 +23,19 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
+# uvloop is a faster drop-in event loop; fall back to asyncio's default loop
+# where it is not installed (it is not available on Windows)
+try:
+    import uvloop
+except ImportError:
+    logger.info("uvloop not installed, using the default asyncio event loop")
+else:
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+
 # Main bot instance (formerly admin_bot)
 bot = Bot(
     token=ConfigManager.get_bot_token(),
+    session=create_bot_session(),
     default=DefaultBotProperties(
         parse_mode=ParseMode.HTML
     )
@@ -41,27 +54,78 @@ dp.message.middleware(MessageLoggingMiddleware())
 dp.include_router(monitor_router)
 dp.include_router(basic_router)
 
+ALLOWED_UPDATES = ["message", "callback_query"]
+
+async def start_webhook(settings: dict):
+    """Serve updates pushed by Telegram until cancelled"""
+    app = web.Application()
+    # handle_in_background acks each webhook with 200 as soon as the update is
+    # parsed and runs the handler as its own task, so slow Bot API or exchange
+    # calls never hold the response past Telegram's delivery timeout
+    SimpleRequestHandler(
+        dispatcher=dp,
+        bot=bot,
+        secret_token=settings['secret'],
+        handle_in_background=True
+    ).register(app, path=settings['path'])
+    setup_application(app, dp, bot=bot)
+
+    # TLS is expected to be terminated by the reverse proxy in front of WEBHOOK_URL
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, host=settings['host'], port=settings['port'])
+    await site.start()
+    logger.info(f"Webhook server listening on {settings['host']}:{settings['port']}{settings['path']}")
+
+    try:
+        await bot.set_webhook(
+            settings['url'],
+            allowed_updates=ALLOWED_UPDATES,
+            secret_token=settings['secret'],
+            drop_pending_updates=True
+        )
+        await asyncio.Event().wait()
+    finally:
+        await runner.cleanup()
+
 async def start_bot():
-    """Start the bot in polling mode"""
+    """Start the bot in webhook mode if WEBHOOK_URL is set, otherwise in polling mode"""
+    webhook_settings = ConfigManager.get_webhook_settings()
     try:
-        await bot.delete_webhook(drop_pending_updates=True)
-        logger.info("Starting bot in polling mode...")
-        
         me = await bot.get_me()
         logger.info(f"Bot started successfully! Username: @{me.username}")
-        
-        await dp.start_polling(bot, allowed_updates=[
-            "message",
-            "callback_query"
-        ])
+
+        if webhook_settings:
+            logger.info("Starting bot in webhook mode...")
+            await start_webhook(webhook_settings)
+        else:
+            await bot.delete_webhook(drop_pending_updates=True)
+            logger.info("Starting bot in polling mode...")
+
+            # Long-poll for 30s so an idle bot issues far fewer getUpdates calls;
+            # handle_as_tasks keeps slow handlers from delaying the next poll
+            await dp.start_polling(
+                bot,
+                allowed_updates=ALLOWED_UPDATES,
+                polling_timeout=30,
+                handle_as_tasks=True
+            )
     except Exception as e:
         logger.error(f"Critical error during bot startup: {str(e)}", exc_info=True)
         raise
     finally:
         logger.info("Bot stopped")
+        await price_streams.close()
+        await exchange_service.close()
         await bot.session.close()
 
 async def main():
+    # Python 3.12+: new tasks run synchronously up to their first await, so
+    # handlers and monitors that finish or block early skip a loop iteration
+    eager_task_factory = getattr(asyncio, "eager_task_factory", None)
+    if eager_task_factory is not None:
+        asyncio.get_running_loop().set_task_factory(eager_task_factory)
+    
     try:
         # Run bot
         await start_bot()
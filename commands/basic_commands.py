@@ -1,38 +1,39 @@
 import logging
-from aiogram import Router
+from aiogram import F, Router
 from aiogram.types import Message
 from aiogram.filters import Command
 from config.config_manager import ConfigManager
+from commands import monitor_commands
+from handlers.exchange_handlers import active_monitors as handler_monitors
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
 basic_router = Router()
 
+WELCOME_MSG = (
+    "Welcome to the Admin Bot! 🛡\n\n"
+    "Available commands:\n"
+    "/status - Check system status\n"
+    "/stats - View monitoring statistics\n\n"
+    "🔍 Multi-Coin Monitoring:\n"
+    "/addcoin [coin] - Add a new coin to monitor\n"
+    "/listcoins - Show all monitored coins\n"
+    "/stop [code] - Stop monitoring a specific coin\n"
+    "/stop_monitor - Stop all monitoring\n"
+    "/setmin [code] [percentage] - Set minimum arbitrage %\n"
+)
+
 @basic_router.message(Command("start"))
 async def cmd_start(message: Message):
     if message.from_user.id in ConfigManager.get_admin_user_ids():
-        await message.answer(
-            "Welcome to the Admin Bot! 🛡\n\n"
-            "Available commands:\n"
-            "/status - Check system status\n"
-            "/stats - View monitoring statistics\n\n"
-            "🔍 Multi-Coin Monitoring:\n"
-            "/addcoin [coin] - Add a new coin to monitor\n"
-            "/listcoins - Show all monitored coins\n"
-            "/stop [code] - Stop monitoring a specific coin\n"
-            "/stop_monitor - Stop all monitoring\n"
-            "/setmin [code] [percentage] - Set minimum arbitrage %\n"
-        )
+        await message.answer(WELCOME_MSG)
     else:
         return
 
 @basic_router.message(Command("stats"))
 async def cmd_stats(message: Message):
     if message.from_user.id in ConfigManager.get_admin_user_ids():
-        from commands.monitor_commands import active_monitors as cmd_monitors
-        from handlers.exchange_handlers import active_monitors as handler_monitors
-        
         # Count total monitors from both implementations
         total_monitors = 0
         
@@ -41,8 +42,12 @@ async def cmd_stats(message: Message):
         for user_monitors in handler_monitors.values():
             handler_coin_count += len(user_monitors)
             
-        # Count monitors from command implementation
-        cmd_coin_count = len(cmd_monitors)
+        # Count monitors from command implementation; its service is created on first use
+        cmd_service = monitor_commands.monitor_service
+        cmd_coin_count = 0
+        if cmd_service is not None:
+            for user_monitors in cmd_service.active_monitors.values():
+                cmd_coin_count += len(user_monitors)
         
         total_monitors = handler_coin_count + cmd_coin_count
         
@@ -57,20 +62,24 @@ async def cmd_stats(message: Message):
         return
 
 # We need to make sure this catch-all handler doesn't interfere with other command handlers
-# To do that, we'll check if the message starts with a command prefix and ignore it
-@basic_router.message(lambda message: not message.text.startswith('/'))
+# To do that, we'll check if the message starts with a command prefix and ignore it.
+# Setup replies never reach this handler: monitor_router is registered first and its
+# setup handler is keyed on user_monitoring_setup, so it consumes them.
+@basic_router.message(F.text & ~F.text.startswith('/'))
 async def debug_chat_info(message: Message):
     """Debug handler to log chat information"""
-    # Skip if waiting for min percentage input (will be handled by monitor_commands)
-    from commands.monitor_commands import user_queries
-    if message.from_user.id in user_queries:
-        return
-        
+    # Lazy %-formatting: nothing is rendered unless INFO is enabled
     logger.info(
-        f"Debug Chat Info:\n"
-        f"Chat ID: {message.chat.id}\n"
-        f"Chat Type: {message.chat.type}\n"
-        f"Chat Title: {message.chat.title if message.chat.title else 'N/A'}\n"
-        f"Username: {message.chat.username if hasattr(message.chat, 'username') else 'N/A'}\n"
-        f"Message From: {message.from_user.full_name} (ID: {message.from_user.id})"
+        "Debug Chat Info:\n"
+        "Chat ID: %s\n"
+        "Chat Type: %s\n"
+        "Chat Title: %s\n"
+        "Username: %s\n"
+        "Message From: %s (ID: %s)",
+        message.chat.id,
+        message.chat.type,
+        message.chat.title or 'N/A',
+        getattr(message.chat, 'username', 'N/A'),
+        message.from_user.full_name,
+        message.from_user.id
     ) 
\ No newline at end of file
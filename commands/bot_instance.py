@@ -1,11 +1,46 @@
+from typing import Any
+
 from aiogram import Bot
+from aiogram.client.session.aiohttp import AiohttpSession
+
+# Bot API connection pool. Almost every request goes to api.telegram.org, so the
+# per-host cap is the one that bounds concurrency; 30 matches Telegram's global
+# limit of ~30 messages per second
+BOT_API_CONNECTION_LIMIT = 100
+BOT_API_CONNECTIONS_PER_HOST = 30
+BOT_API_KEEPALIVE_TIMEOUT = 75  # seconds to keep idle connections warm between bursts
+BOT_API_DNS_CACHE_TTL = 300  # seconds to reuse the resolved api.telegram.org address
 
 # This will be set in bot.py
 bot = None
 
+class PooledAiohttpSession(AiohttpSession):
+    """
+    AiohttpSession whose TCPConnector takes extra pool settings.
+    aiogram only exposes limit, so the rest are merged into the arguments it
+    builds the connector from. That dict is internal to aiogram 3, which is why
+    requirements.txt pins aiogram below 4; if it goes away, this fails at
+    startup instead of silently dropping the settings.
+    """
+    def __init__(self, limit: int = 100, **connector_kwargs: Any):
+        super().__init__(limit=limit)
+        connector_init = getattr(self, "_connector_init", None)
+        if not isinstance(connector_init, dict):
+            raise RuntimeError("Unsupported aiogram version: AiohttpSession no longer has _connector_init")
+        connector_init.update(connector_kwargs)
+
+def create_bot_session() -> AiohttpSession:
+    """Create the pooled keep-alive session shared by every Bot API call"""
+    return PooledAiohttpSession(
+        limit=BOT_API_CONNECTION_LIMIT,
+        limit_per_host=BOT_API_CONNECTIONS_PER_HOST,
+        keepalive_timeout=BOT_API_KEEPALIVE_TIMEOUT,
+        ttl_dns_cache=BOT_API_DNS_CACHE_TTL
+    )
+
 def set_bot_instance(bot_instance):
     global bot
     bot = bot_instance
     
 def get_bot_instance():
-    return bot 
\ No newline at end of file
+    return bot
@@ -1,16 +1,20 @@
 import asyncio
 import logging
 import os
-import uuid
-from typing import Dict, Any, Optional
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Union
 
 from aiogram import Router, F
 from aiogram.types import Message, CallbackQuery, InlineKeyboardMarkup
 from aiogram.utils.keyboard import InlineKeyboardBuilder
-from aiogram.filters import Command
+from aiogram.filters import Command, Filter
 
 from config.config_manager import ConfigManager
 from commands.bot_instance import get_bot_instance
+from middlewares.admin_only import AdminOnlyMiddleware
+from services.monitor_service import MonitorService
+from services.session_store import SessionStore
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -18,15 +22,44 @@ logger = logging.getLogger(__name__)
 # Create router with name to help with debugging
 monitor_router = Router(name="monitor_commands")
 
-# Format: {user_id: {"coin": coin_name, "filter_mode": None, 
-#                   "network": None, "pool_address": None, "waiting_for": step}}
-user_monitoring_setup = {}
+@dataclass(slots=True)
+class SetupState:
+    """Answers collected so far by one user's /addcoin setup wizard"""
+    coin: str
+    filter_mode: Optional[str] = None
+    network: Optional[str] = None
+    pool_address: Optional[str] = None
+    # Next expected input: "network", "pool_address", "deposit_check" or "percentage"
+    waiting_for: Optional[str] = None
+    enforce_deposit_withdrawal_checks: bool = False
 
-# Delay import of MonitorService to avoid circular import
-# and initialize it later after the module is fully loaded
+# Setups abandoned for this many seconds are dropped instead of being kept forever
+SETUP_TTL = 30 * 60
+
+# Format: {user_id: SetupState}
+user_monitoring_setup = SessionStore(SETUP_TTL)
+
+# Plain decimal percentage such as "0.5", "2" or ".75", surrounding whitespace allowed
+_PCT_RE = re.compile(r"^\s*(\d+(?:\.\d+)?|\.\d+)\s*$")
+
+# Pool address: EVM address or 32-byte pool ID (0x + 40/64 hex), or a Solana base58 address
+_ADDR_RE = re.compile(r"^(0x[0-9a-fA-F]{40}(?:[0-9a-fA-F]{24})?|[1-9A-HJ-NP-Za-km-z]{32,44})$")
+
+# Replies shared by several handlers
+NO_ACTIVE_SETUP_MSG = "No active monitoring setup found. Please use /addcoin command first."
+
+def _admin_ids() -> frozenset[int]:
+    """Admin user IDs, parsed once and cached by ConfigManager until invalidate_admins()"""
+    return ConfigManager.get_admin_user_ids()
+
+# Every monitor command and callback is admin-only; reject others before the handler runs
+monitor_router.message.middleware(AdminOnlyMiddleware(_admin_ids))
+monitor_router.callback_query.middleware(AdminOnlyMiddleware(_admin_ids))
+
+# Created on first use by _ensure_monitor_service()
 monitor_service = None
 
-def get_filter_mode_keyboard() -> InlineKeyboardMarkup:
+def _build_filter_mode_keyboard() -> InlineKeyboardMarkup:
     """Create a keyboard for selecting filter mode"""
     builder = InlineKeyboardBuilder()
     
@@ -53,29 +86,37 @@ def get_filter_mode_keyboard() -> InlineKeyboardMarkup:
     builder.adjust(1)
     return builder.as_markup()
 
-def get_network_keyboard() -> InlineKeyboardMarkup:
+# The filter keyboard never changes, so build it once and share it
+_FILTER_MODE_KEYBOARD = _build_filter_mode_keyboard()
+
+def get_filter_mode_keyboard() -> InlineKeyboardMarkup:
+    """Keyboard for selecting filter mode (shared instance, do not modify)"""
+    return _FILTER_MODE_KEYBOARD
+
+# API network identifier -> display name, in keyboard order
+NETWORK_DISPLAY_NAMES = {
+    "ether": "Ethereum",
+    "solana": "Solana",
+    "base": "Base",
+    "avalanche": "Avalanche",
+    "bsc": "BSC",
+    "arbitrum": "Arbitrum"
+}
+
+def _build_network_keyboard() -> InlineKeyboardMarkup:
     """Create a keyboard for selecting network"""
     builder = InlineKeyboardBuilder()
     
-    networks = [
-        {"text": "Ethereum", "callback_data": "network_ether"},
-        {"text": "Solana", "callback_data": "network_solana"},
-        {"text": "Base", "callback_data": "network_base"},
-        {"text": "Avalanche", "callback_data": "network_avalanche"},
-        {"text": "BSC", "callback_data": "network_bsc"},
-        {"text": "Arbitrum", "callback_data": "network_arbitrum"}
-    ]
-    
-    for network in networks:
+    for network_id, network_display in NETWORK_DISPLAY_NAMES.items():
         builder.button(
-            text=network["text"],
-            callback_data=network["callback_data"]
+            text=network_display,
+            callback_data=f"network_{network_id}"
         )
     
     builder.adjust(2)
     return builder.as_markup()
 
-def get_deposit_withdrawal_check_keyboard() -> InlineKeyboardMarkup:
+def _build_deposit_withdrawal_check_keyboard() -> InlineKeyboardMarkup:
     """Create a keyboard for selecting deposit/withdrawal check setting"""
     builder = InlineKeyboardBuilder()
     
@@ -92,25 +133,62 @@ def get_deposit_withdrawal_check_keyboard() -> InlineKeyboardMarkup:
     builder.adjust(1)
     return builder.as_markup()
 
+_NETWORK_KEYBOARD = _build_network_keyboard()
+_DEPOSIT_CHECK_KEYBOARD = _build_deposit_withdrawal_check_keyboard()
+
+def get_network_keyboard() -> InlineKeyboardMarkup:
+    """Keyboard for selecting network (shared instance, do not modify)"""
+    return _NETWORK_KEYBOARD
+
+def get_deposit_withdrawal_check_keyboard() -> InlineKeyboardMarkup:
+    """Keyboard for selecting deposit/withdrawal check setting (shared instance, do not modify)"""
+    return _DEPOSIT_CHECK_KEYBOARD
+
+# Human-readable filter modes; any other mode is shown as "CEX-CEX + DEX"
+FILTER_MODE_TEXT: Dict[str, str] = {
+    "cex_only": "CEX-CEX Only (no DEX)",
+    "cex_dex_only": "ONLY CEX-DEX",
+    "future": "DEX + CEX (ONLY FUTURE)",
+    "all": "CEX-CEX + DEX",
+}
+
+# Filter keyboard callback_data -> filter mode; also the set of callbacks the filter handler accepts
+CALLBACK_TO_FILTER: Dict[str, str] = {
+    "filter_cex": "cex_only",
+    "filter_cex_dex_only": "cex_dex_only",
+    "filter_future": "future",
+    "filter_all": "all",
+}
+
 def get_filter_mode_display_text(filter_mode: str) -> str:
     """Convert filter mode to human-readable text"""
-    if filter_mode == "cex_only":
-        return "CEX-CEX Only (no DEX)"
-    elif filter_mode == "cex_dex_only":
-        return "ONLY CEX-DEX" 
-    elif filter_mode == "future":
-        return "DEX + CEX (ONLY FUTURE)"
-    else:
-        return "CEX-CEX + DEX"
+    return FILTER_MODE_TEXT.get(filter_mode, FILTER_MODE_TEXT["all"])
+
+def format_setup_header(coin: str, filter_mode: str, network: Optional[str] = None,
+                        pool_address: Optional[str] = None) -> str:
+    """
+    Summary lines shown at the top of each setup wizard prompt.
+
+    Args:
+        coin: Coin being set up
+        filter_mode: Selected filter mode
+        network: Network to show, if one was chosen
+        pool_address: Pool address to show, if one was entered
+
+    Returns:
+        Newline-separated header without a trailing newline
+    """
+    parts = [f"Coin: {coin}", f"Filter mode: {get_filter_mode_display_text(filter_mode)}"]
+    if network:
+        parts.append(f"Network: {network}")
+    if pool_address:
+        parts.append(f"Pool Address: {pool_address}")
+    return "\n".join(parts)
 
 @monitor_router.message(Command("monitor"))
 async def cmd_monitor(message: Message):
     """Deprecated - redirects users to /addcoin"""
-    logger.info(f"Received /monitor command from user {message.from_user.id}")
-    if message.from_user.id not in ConfigManager.get_admin_user_ids():
-        await message.answer("⚠️ You don't have permission to use this command.")
-        return
-
+    logger.info("Received /monitor command from user %s", message.from_user.id)
     # Redirect users to use the addcoin command instead
     await message.answer(
         "⚠️ The /monitor command is deprecated.\n\n"
@@ -118,127 +196,99 @@ async def cmd_monitor(message: Message):
         "Example: /addcoin BTC"
     )
 
-@monitor_router.callback_query(F.data.startswith("filter_"))
+@monitor_router.callback_query(F.data.in_(CALLBACK_TO_FILTER))
 async def handle_filter_mode_callback(callback: CallbackQuery):
     """Handle filter mode selection"""
     user_id = callback.from_user.id
     
-    logger.info(f"Received filter callback from user {user_id}: {callback.data}")
-    
-    # Check if user is admin
-    if user_id not in ConfigManager.get_admin_user_ids():
-        logger.warning(f"Non-admin user {user_id} attempted to change filter settings")
-        return
-    
     # Check if user has an active setup
-    if user_id not in user_monitoring_setup:
-        await callback.answer("No active monitoring setup found. Please use /addcoin command first.", show_alert=True)
+    setup = user_monitoring_setup.touch(user_id)
+    if setup is None:
+        await callback.answer(NO_ACTIVE_SETUP_MSG, show_alert=True)
         return
     
-    # Ensure MonitorService is initialized
-    _ensure_monitor_service()
-    
-    # Extract filter mode from callback data
-    filter_mode = monitor_service.parse_filter_mode(callback.data)
+    # The handler filter guarantees the callback data is a known filter option
+    filter_mode = CALLBACK_TO_FILTER[callback.data]
     
     # Store the filter mode in the user's setup
-    user_monitoring_setup[user_id]["filter_mode"] = filter_mode
-    # Initialize network and token address fields if not present
-    if "network" not in user_monitoring_setup[user_id]:
-        user_monitoring_setup[user_id]["network"] = None
-    if "pool_address" not in user_monitoring_setup[user_id]:
-        user_monitoring_setup[user_id]["pool_address"] = None
+    setup.filter_mode = filter_mode
         
-    logger.info(f"Set filter mode for user {user_id} to {filter_mode}")
-    
-    # Get the stored coin
-    coin = user_monitoring_setup[user_id]["coin"]
+    logger.info("Set filter mode for user %s to %s (%s)", user_id, filter_mode, callback.data)
     
     # Get display text for the selected filter mode
     mode_text = get_filter_mode_display_text(filter_mode)
     
-    # Always answer the callback to prevent the "loading" state
-    await callback.answer(f"Filter set to: {mode_text}")
-    
     # For DEX related filters, ask for network and token address first
     if filter_mode in ["cex_dex_only", "future", "all"]:
         # Show network selection keyboard
-        network_keyboard = get_network_keyboard()
-        await callback.message.answer(
-            f"Coin: {coin}\nFilter mode: {mode_text}\n\n"
-            f"Please select the network:",
-            reply_markup=network_keyboard
+        prompt = (
+            f"{format_setup_header(setup.coin, filter_mode)}\n\n"
+            f"Please select the network:"
         )
+        keyboard = get_network_keyboard()
         # Mark that we're waiting for network input
-        user_monitoring_setup[user_id]["waiting_for"] = "network"
+        setup.waiting_for = "network"
     else:
         # For CEX-only mode, proceed to ask about deposit/withdrawal checks
-        deposit_check_keyboard = get_deposit_withdrawal_check_keyboard()
-        await callback.message.answer(
-            f"Coin: {coin}\nFilter mode: {mode_text}\n\n"
+        prompt = (
+            f"{format_setup_header(setup.coin, filter_mode)}\n\n"
             f"Would you like to enforce deposit/withdrawal checks?\n"
-            f"This makes alerts more accurate but might be slower:",
-            reply_markup=deposit_check_keyboard
+            f"This makes alerts more accurate but might be slower:"
         )
+        keyboard = get_deposit_withdrawal_check_keyboard()
         # Mark that we're waiting for deposit check input
-        user_monitoring_setup[user_id]["waiting_for"] = "deposit_check"
+        setup.waiting_for = "deposit_check"
+    
+    # Answering the callback clears the button's loading state, so send it
+    # together with the next prompt rather than one round-trip ahead of it.
+    # Wizard steps edit the prompt the button was on instead of posting a new
+    # message, which also removes the keyboard that was just used
+    await asyncio.gather(
+        callback.answer(f"Filter set to: {mode_text}"),
+        callback.message.edit_text(prompt, reply_markup=keyboard)
+    )
 
 @monitor_router.callback_query(F.data.startswith("network_"))
 async def handle_network_callback(callback: CallbackQuery):
     """Handle network selection"""
     user_id = callback.from_user.id
     
-    logger.info(f"Received network callback from user {user_id}: {callback.data}")
-    
-    # Check if user is admin
-    if user_id not in ConfigManager.get_admin_user_ids():
-        logger.warning(f"Non-admin user {user_id} attempted to select network")
-        await callback.answer("Only admins can select network", show_alert=True)
-        return
+    logger.info("Received network callback from user %s: %s", user_id, callback.data)
     
     # Check if user has an active setup
-    if user_id not in user_monitoring_setup:
-        await callback.answer("No active monitoring setup found. Please use /addcoin command first.", show_alert=True)
+    setup = user_monitoring_setup.touch(user_id)
+    if setup is None:
+        await callback.answer(NO_ACTIVE_SETUP_MSG, show_alert=True)
         return
     
     # Check if user is waiting for network input
-    if user_monitoring_setup[user_id].get("waiting_for") != "network":
+    if setup.waiting_for != "network":
         await callback.answer("Unexpected network selection", show_alert=True)
         return
     
     # Extract network from callback data (remove "network_" prefix)
     network_id = callback.data[8:]  # Use exact API network identifier
     
-    # Map network_id to display name for UI
-    network_display_names = {
-        "ether": "Ethereum",
-        "solana": "Solana",
-        "base": "Base",
-        "avalanche": "Avalanche",
-        "bsc": "BSC",
-        "arbitrum": "Arbitrum"
-    }
-    
-    network_display = network_display_names.get(network_id, network_id.capitalize())
+    # Only networks offered on the keyboard are accepted
+    network_display = NETWORK_DISPLAY_NAMES.get(network_id)
+    if network_display is None:
+        await callback.answer("Unknown network", show_alert=True)
+        return
     
     # Store the network in the user's setup (using API-compatible network id)
-    user_monitoring_setup[user_id]["network"] = network_id
-    user_monitoring_setup[user_id]["waiting_for"] = "pool_address"
+    setup.network = network_id
+    setup.waiting_for = "pool_address"
     
     # Get the stored coin
-    coin = user_monitoring_setup[user_id]["coin"]
-    
-    # Get display text for the selected filter mode
-    filter_mode = user_monitoring_setup[user_id]["filter_mode"]
-    mode_text = get_filter_mode_display_text(filter_mode)
-    
-    # Always answer the callback to prevent the "loading" state
-    await callback.answer(f"Network set to: {network_display}")
-    
-    # Ask for pool address
-    await callback.message.answer(
-        f"Coin: {coin}\nFilter mode: {mode_text}\nNetwork: {network_display}\n\n"
-        f"Now, please enter the pool address for {coin} on {network_display}"
+    coin = setup.coin
+    
+    # Answer the callback and ask for pool address
+    await asyncio.gather(
+        callback.answer(f"Network set to: {network_display}"),
+        callback.message.edit_text(
+            f"{format_setup_header(coin, setup.filter_mode, network_display)}\n\n"
+            f"Now, please enter the pool address for {coin} on {network_display}"
+        )
     )
 
 @monitor_router.callback_query(F.data.startswith("deposit_check_"))
@@ -246,21 +296,16 @@ async def handle_deposit_check_callback(callback: CallbackQuery):
     """Handle deposit/withdrawal check selection"""
     user_id = callback.from_user.id
     
-    logger.info(f"Received deposit check callback from user {user_id}: {callback.data}")
-    
-    # Check if user is admin
-    if user_id not in ConfigManager.get_admin_user_ids():
-        logger.warning(f"Non-admin user {user_id} attempted to set deposit check")
-        await callback.answer("Only admins can change this setting", show_alert=True)
-        return
+    logger.info("Received deposit check callback from user %s: %s", user_id, callback.data)
     
     # Check if user has an active setup
-    if user_id not in user_monitoring_setup:
-        await callback.answer("No active monitoring setup found. Please use /addcoin command first.", show_alert=True)
+    setup = user_monitoring_setup.touch(user_id)
+    if setup is None:
+        await callback.answer(NO_ACTIVE_SETUP_MSG, show_alert=True)
         return
     
     # Check if user is waiting for deposit check input
-    if user_monitoring_setup[user_id].get("waiting_for") != "deposit_check":
+    if setup.waiting_for != "deposit_check":
         await callback.answer("Unexpected deposit check selection", show_alert=True)
         return
     
@@ -268,30 +313,21 @@ async def handle_deposit_check_callback(callback: CallbackQuery):
     deposit_check = callback.data == "deposit_check_yes"
     
     # Store the setting in the user's setup
-    user_monitoring_setup[user_id]["enforce_deposit_withdrawal_checks"] = deposit_check
-    user_monitoring_setup[user_id]["waiting_for"] = "percentage"
+    setup.enforce_deposit_withdrawal_checks = deposit_check
+    setup.waiting_for = "percentage"
     
-    # Get the stored coin and other information for display
-    coin = user_monitoring_setup[user_id]["coin"]
-    filter_mode = user_monitoring_setup[user_id]["filter_mode"]
-    mode_text = get_filter_mode_display_text(filter_mode)
+    # Network and pool address are only set, and so only shown, for DEX modes
+    header = format_setup_header(setup.coin, setup.filter_mode, setup.network, setup.pool_address)
     
-    # Prepare other information for display
-    additional_info = ""
-    if filter_mode in ["cex_dex_only", "future", "all"]:
-        network = user_monitoring_setup[user_id]["network"]
-        pool_address = user_monitoring_setup[user_id]["pool_address"]
-        additional_info = f"\nNetwork: {network}\nPool Address: {pool_address}"
-    
-    # Always answer the callback to prevent the "loading" state
+    # Answer the callback and ask for minimum percentage
     check_status = "Enabled" if deposit_check else "Disabled"
-    await callback.answer(f"Deposit/Withdrawal Checks: {check_status}")
-    
-    # Ask for minimum percentage
-    await callback.message.answer(
-        f"Coin: {coin}\nFilter mode: {mode_text}{additional_info}\n"
-        f"Deposit/Withdrawal Checks: {check_status}\n\n"
-        f"Finally, please enter the minimum arbitrage percentage (e.g., 0.5 for 0.5%)"
+    await asyncio.gather(
+        callback.answer(f"Deposit/Withdrawal Checks: {check_status}"),
+        callback.message.edit_text(
+            f"{header}\n"
+            f"Deposit/Withdrawal Checks: {check_status}\n\n"
+            f"Finally, please enter the minimum arbitrage percentage (e.g., 0.5 for 0.5%)"
+        )
     )
 
 @monitor_router.message(Command("cancel"))
@@ -299,79 +335,91 @@ async def cmd_cancel(message: Message):
     """Cancel the current monitoring setup process"""
     user_id = message.from_user.id
     
-    if user_id in user_monitoring_setup:
-        # Get the coin being set up
-        coin = user_monitoring_setup[user_id]["coin"]
-        # Clean up
-        del user_monitoring_setup[user_id]
-        await message.answer(f"✅ Monitoring setup for {coin} has been cancelled.")
+    setup = user_monitoring_setup.pop(user_id, None)
+    if setup is not None:
+        await message.answer(f"✅ Monitoring setup for {setup.coin} has been cancelled.")
     else:
         await message.answer("No monitoring setup in progress to cancel.")
 
-# This filter needs to run before the catch-all handler in basic_commands
-@monitor_router.message(lambda message: message.from_user.id in user_monitoring_setup and not message.text.startswith('/'))
-async def handle_min_percentage(message: Message):
-    """Handle input for monitoring setup wizard (pool address or percentage)"""
-    logger.info(f"Processing input from user {message.from_user.id} who is in user_monitoring_setup")
-    user_id = message.from_user.id
-    
-    if user_id not in ConfigManager.get_admin_user_ids():
-        return
-    
-    # Get the user's setup data
-    setup_data = user_monitoring_setup.get(user_id)
-    if not setup_data:
-        await message.answer("⚠️ No active setup found. Please use /addcoin command.")
-        return
-    
-    # Get the coin and filter mode
-    coin = setup_data["coin"]
-    filter_mode = setup_data["filter_mode"]
-    waiting_for = setup_data.get("waiting_for", "percentage")  # Default to percentage for backward compatibility
-    
-    # Ensure filter mode is set
-    if not filter_mode:
-        # If filter mode is not set, ask for it first
+class InSetupFilter(Filter):
+    """
+    Match non-command text messages from users whose setup is at one of the given steps.
+    The matched SetupState is passed to the handler as its setup argument.
+    """
+    def __init__(self, *waiting_for: Optional[str]):
+        self.waiting_for = frozenset(waiting_for)
+
+    async def __call__(self, message: Message) -> Union[bool, Dict[str, Any]]:
+        # Cheapest checks first: most updates here are media or commands
+        text = message.text
+        if text is None or text[:1] == "/":
+            return False
+        user = message.from_user
+        if user is None:
+            return False
+        # The step filters cover every state between them, so a user with a live
+        # setup always reaches one of these handlers and touching here is safe
+        setup = user_monitoring_setup.touch(user.id)
+        if setup is None or setup.waiting_for not in self.waiting_for:
+            return False
+        return {"setup": setup}
+
+# These filters need to run before the catch-all handler in basic_commands
+@monitor_router.message(InSetupFilter(None))
+async def handle_filter_mode_pending(message: Message, setup: SetupState):
+    """Remind the user to pick a filter mode, the first step after /addcoin"""
+    await message.answer(
+        f"⚠️ Please select a filter mode for {setup.coin} first:", 
+        reply_markup=get_filter_mode_keyboard()
+    )
+
+@monitor_router.message(InSetupFilter("pool_address"))
+async def handle_pool_address_input(message: Message, setup: SetupState):
+    """Handle the pool address step of the setup wizard"""
+    logger.info("Processing pool address from user %s", message.from_user.id)
+    pool_address = message.text.strip()
+    if not _ADDR_RE.match(pool_address):
         await message.answer(
-            f"⚠️ Please select a filter mode for {coin} first:", 
-            reply_markup=get_filter_mode_keyboard()
+            "⚠️ Invalid pool address format. Please send a 0x-prefixed EVM address "
+            "or a Solana address, or use /cancel to abort."
         )
         return
+    setup.pool_address = pool_address
+    setup.waiting_for = "deposit_check"
     
-    # If waiting for pool address
-    if waiting_for == "pool_address":
-        pool_address = message.text.strip()
-        setup_data["pool_address"] = pool_address
-        setup_data["waiting_for"] = "deposit_check"
-        
-        # Get network for display
-        network = setup_data["network"]
-        
-        # Show deposit/withdrawal check selection keyboard
-        deposit_check_keyboard = get_deposit_withdrawal_check_keyboard()
-        await message.answer(
-            f"Pool address: {pool_address}\n"
-            f"Network: {network}\n\n"
-            f"Would you like to enforce deposit/withdrawal checks?\n"
-            f"This makes alerts more accurate but might be slower:",
-            reply_markup=deposit_check_keyboard
-        )
-        return
+    # Show deposit/withdrawal check selection keyboard
+    deposit_check_keyboard = get_deposit_withdrawal_check_keyboard()
+    await message.answer(
+        f"Pool address: {pool_address}\n"
+        f"Network: {setup.network}\n\n"
+        f"Would you like to enforce deposit/withdrawal checks?\n"
+        f"This makes alerts more accurate but might be slower:",
+        reply_markup=deposit_check_keyboard
+    )
+
+# Text sent while a keyboard step is pending is also read as the percentage, as before
+@monitor_router.message(InSetupFilter("percentage", "network", "deposit_check"))
+async def handle_min_percentage(message: Message, setup: SetupState):
+    """Handle the minimum percentage step, which completes the setup and starts monitoring"""
+    logger.info("Processing percentage input from user %s", message.from_user.id)
+    user_id = message.from_user.id
+    coin = setup.coin
+    filter_mode = setup.filter_mode
     
     # Parse the minimum percentage
-    try:
-        min_percentage = float(message.text.strip())
-        if min_percentage <= 0:
-            await message.answer("Minimum percentage must be greater than 0. Please try again or use /cancel to abort.")
-            return
-    except ValueError:
+    match = _PCT_RE.match(message.text)
+    if not match:
         await message.answer("Please enter a valid number (e.g., 0.5 for 0.5%). Try again or use /cancel to abort.")
         return
+    min_percentage = float(match.group(1))
+    if min_percentage <= 0:
+        await message.answer("Minimum percentage must be greater than 0. Please try again or use /cancel to abort.")
+        return
     
     # For DEX modes, ensure network and pool address are provided
     if filter_mode in ["cex_dex_only", "future", "all"]:
-        network = setup_data.get("network")
-        pool_address = setup_data.get("pool_address")
+        network = setup.network
+        pool_address = setup.pool_address
         
         if not network or not pool_address:
             missing = []
@@ -384,19 +432,19 @@ async def handle_min_percentage(message: Message):
             return
     
     # Store setup data for use in monitoring
-    network = setup_data.get("network")
-    pool_address = setup_data.get("pool_address")
-    enforce_deposit_withdrawal_checks = setup_data.get("enforce_deposit_withdrawal_checks", False)
-    
-    # Generate a unique query ID
-    query_id = str(uuid.uuid4())
+    network = setup.network
+    pool_address = setup.pool_address
+    enforce_deposit_withdrawal_checks = setup.enforce_deposit_withdrawal_checks
     
     # Remove the setup from the waiting list
-    del user_monitoring_setup[user_id]
+    user_monitoring_setup.pop(user_id, None)
     
     # Ensure MonitorService is initialized
     _ensure_monitor_service()
     
+    # Generate a unique query ID
+    query_id = monitor_service.new_query_id()
+    
     try:
         # Start monitoring using the service
         result = await monitor_service.start_monitoring(
@@ -412,42 +460,37 @@ async def handle_min_percentage(message: Message):
         )
         
         if result["success"]:
-            # Get display text for the filter mode
-            mode_text = get_filter_mode_display_text(filter_mode)
+            # Build the success message line by line
+            lines = [
+                f"✅ Monitoring started for {coin} (Monitor ID: {query_id[:8]})!",
+                "",
+                f"Filter mode: {get_filter_mode_display_text(filter_mode)}",
+            ]
             
-            # Prepare network and pool address info for display
-            dex_info = ""
+            # Network and pool address only apply to DEX modes
             if filter_mode in ["cex_dex_only", "future", "all"]:
-                dex_info = f"\nNetwork: {network}\nPool Address: {pool_address}"
+                lines.append(f"Network: {network}")
+                lines.append(f"Pool Address: {pool_address}")
             
-            # Add deposit/withdrawal check info
             check_status = "Enabled" if enforce_deposit_withdrawal_checks else "Disabled"
-                
+            lines.append(f"Deposit/Withdrawal Checks: {check_status}")
+            lines.append(f"I will notify you when there are arbitrage opportunities with >{min_percentage}% difference.")
+            lines.append("Use /stop command with ID to stop specific monitoring or /stop_monitor to stop all.")
+            
             # Send success message to the user
-            await message.answer(
-                f"✅ Monitoring started for {coin} (Monitor ID: {query_id[:8]})!\n\n"
-                f"Filter mode: {mode_text}{dex_info}\n"
-                f"Deposit/Withdrawal Checks: {check_status}\n"
-                f"I will notify you when there are arbitrage opportunities with >{min_percentage}% difference.\n"
-                "Use /stop command with ID to stop specific monitoring or /stop_monitor to stop all.",
-                parse_mode=None
-            )
+            await message.answer("\n".join(lines), parse_mode=None)
         else:
             await message.answer(f"❌ Error starting monitoring: {result['error']}")
     except Exception as e:
-        logger.error(f"Error starting monitoring: {str(e)}", exc_info=True)
+        logger.error("Error starting monitoring: %s", e, exc_info=True)
         await message.answer(f"❌ Error starting monitoring: {str(e)}")
 
 @monitor_router.message(Command("stop"))
 async def cmd_stop(message: Message):
     """Stop monitoring a specific coin by ID"""
-    logger.info(f"Received /stop command from user {message.from_user.id}")
-    if message.from_user.id not in ConfigManager.get_admin_user_ids():
-        await message.answer("⚠️ You don't have permission to use this command.")
-        return
-
+    logger.info("Received /stop command from user %s", message.from_user.id)
     # Parse arguments: /stop [monitor_id]
-    args = message.text.split()
+    args = message.text.split(maxsplit=2)
     monitor_id = args[1] if len(args) > 1 else None
     
     if not monitor_id:
@@ -469,9 +512,6 @@ async def cmd_stop(message: Message):
 @monitor_router.message(Command("stop_monitor"))
 async def cmd_stop_monitor(message: Message):
     """Stop all monitoring tasks"""
-    if message.from_user.id not in ConfigManager.get_admin_user_ids():
-        return
-
     # Ensure MonitorService is initialized
     _ensure_monitor_service()
     
@@ -481,19 +521,16 @@ async def cmd_stop_monitor(message: Message):
     await message.answer(f"✅ Monitoring stopped for all {result['count']} coins")
     
     # Also log the details
-    logger.info(f"Stopped {result['count']} monitors ({result['details']})")
+    logger.info("Stopped %s monitors (%s)", result['count'], result['details'])
 
 @monitor_router.message(Command("set_filter"))
 async def cmd_set_filter(message: Message):
     """Explicitly set the filter mode for monitoring"""
-    logger.info(f"Received /set_filter command from user {message.from_user.id}")
-    if message.from_user.id not in ConfigManager.get_admin_user_ids():
-        await message.answer("⚠️ You don't have permission to use this command.")
-        return
-
-    # Extract filter mode from command
-    args = message.text.split()
-    if len(args) < 2 or args[1].lower() not in ["cex", "cex_dex", "all"]:
+    logger.info("Received /set_filter command from user %s", message.from_user.id)
+    # Extract filter mode from command; only the first argument is used, lowercased once
+    args = message.text.split(maxsplit=2)
+    mode_arg = args[1].lower() if len(args) > 1 else ""
+    if mode_arg not in ("cex", "cex_dex", "all"):
         await message.answer("❌ Please specify a valid filter mode. Example: /set_filter cex (for CEX-CEX only), /set_filter cex_dex (for ONLY CEX-DEX), or /set_filter all (for CEX+DEX)")
         return
 
@@ -501,7 +538,7 @@ async def cmd_set_filter(message: Message):
     _ensure_monitor_service()
     
     # Get the filter mode
-    filter_mode = monitor_service.parse_filter_mode_from_command(args[1].lower())
+    filter_mode = monitor_service.parse_filter_mode_from_command(mode_arg)
     
     # Set the filter mode using the service
     monitor_service.set_global_filter_mode(filter_mode)
@@ -513,32 +550,26 @@ async def cmd_set_filter(message: Message):
     await message.answer(f"✅ Filter mode set to: {mode_text}")
     
     # If user has a pending query, continue with appropriate next step
-    if message.from_user.id in user_monitoring_setup:
-        coin = user_monitoring_setup[message.from_user.id]["coin"]
-        user_monitoring_setup[message.from_user.id]["filter_mode"] = filter_mode
-        
-        # Initialize network and pool address fields
-        if "network" not in user_monitoring_setup[message.from_user.id]:
-            user_monitoring_setup[message.from_user.id]["network"] = None
-        if "pool_address" not in user_monitoring_setup[message.from_user.id]:
-            user_monitoring_setup[message.from_user.id]["pool_address"] = None
+    setup = user_monitoring_setup.touch(message.from_user.id)
+    if setup is not None:
+        setup.filter_mode = filter_mode
         
         # For DEX related filters, ask for network and pool address
         if filter_mode in ["cex_dex_only", "future", "all"]:
-            user_monitoring_setup[message.from_user.id]["waiting_for"] = "network"
+            setup.waiting_for = "network"
             # Show network selection keyboard
             network_keyboard = get_network_keyboard()
             await message.answer(
-                f"Coin: {coin}\nFilter mode: {mode_text}\n\n"
+                f"{format_setup_header(setup.coin, filter_mode)}\n\n"
                 f"Please select the network:",
                 reply_markup=network_keyboard
             )
         else:
             # For CEX-only mode, proceed to ask about deposit/withdrawal checks
-            user_monitoring_setup[message.from_user.id]["waiting_for"] = "deposit_check"
+            setup.waiting_for = "deposit_check"
             deposit_check_keyboard = get_deposit_withdrawal_check_keyboard()
             await message.answer(
-                f"Coin: {coin}\nFilter mode: {mode_text}\n\n"
+                f"{format_setup_header(setup.coin, filter_mode)}\n\n"
                 f"Would you like to enforce deposit/withdrawal checks?\n"
                 f"This makes alerts more accurate but might be slower:",
                 reply_markup=deposit_check_keyboard
@@ -547,13 +578,9 @@ async def cmd_set_filter(message: Message):
 @monitor_router.message(Command("addcoin"))
 async def cmd_add_coin(message: Message):
     """Add a new coin to monitor"""
-    logger.info(f"Received /addcoin command from user {message.from_user.id}")
-    if message.from_user.id not in ConfigManager.get_admin_user_ids():
-        await message.answer("⚠️ You don't have permission to use this command.")
-        return
-
-    # Extract coin name from command
-    args = message.text.split()
+    logger.info("Received /addcoin command from user %s", message.from_user.id)
+    # Extract coin name from command; only the first argument is used, so stop splitting after it
+    args = message.text.split(maxsplit=2)
     if len(args) < 2:
         await message.answer("❌ Please specify a coin to monitor. Example: /addcoin BTC")
         return
@@ -561,10 +588,7 @@ async def cmd_add_coin(message: Message):
     coin = args[1].upper()
     
     # Store the coin and initialize setup
-    user_monitoring_setup[message.from_user.id] = {
-        "coin": coin,
-        "filter_mode": None
-    }
+    user_monitoring_setup[message.from_user.id] = SetupState(coin=coin)
     
     # Always ask for filter mode
     try:
@@ -573,21 +597,17 @@ async def cmd_add_coin(message: Message):
             f"Coin: {coin}\nStep 1/2: Please select which opportunities to monitor:",
             reply_markup=keyboard
         )
-        logger.info(f"Sent filter selection keyboard to user {message.from_user.id} for coin {coin}")
+        logger.info("Sent filter selection keyboard to user %s for coin %s", message.from_user.id, coin)
     except Exception as e:
-        logger.error(f"Error creating or sending filter keyboard: {str(e)}", exc_info=True)
+        logger.error("Error creating or sending filter keyboard: %s", e, exc_info=True)
         # Cancel the setup if there's an error
-        if message.from_user.id in user_monitoring_setup:
-            del user_monitoring_setup[message.from_user.id]
+        user_monitoring_setup.pop(message.from_user.id, None)
         await message.answer("❌ An error occurred setting up monitoring. Please try again.")
 
 @monitor_router.message(Command("listcoins"))
 async def cmd_list_coins(message: Message):
     """List all coins being monitored"""
-    logger.info(f"Received /listcoins command from user {message.from_user.id}")
-    if message.from_user.id not in ConfigManager.get_admin_user_ids():
-        await message.answer("⚠️ You don't have permission to use this command.")
-        return
+    logger.info("Received /listcoins command from user %s", message.from_user.id)
     
     # Ensure MonitorService is initialized
     _ensure_monitor_service()
@@ -608,26 +628,22 @@ async def cmd_list_coins(message: Message):
 @monitor_router.message(Command("setmin"))
 async def cmd_set_min_percentage(message: Message):
     """Set minimum arbitrage percentage for a specific coin by ID"""
-    logger.info(f"Received /setmin command from user {message.from_user.id}")
-    if message.from_user.id not in ConfigManager.get_admin_user_ids():
-        await message.answer("⚠️ You don't have permission to use this command.")
-        return
-
+    logger.info("Received /setmin command from user %s", message.from_user.id)
     # Parse arguments: /setmin <monitor_id> <percentage>
-    args = message.text.split()
+    args = message.text.split(maxsplit=3)
     if len(args) < 3:
         await message.answer("⚠️ Please specify a monitor ID and percentage.\nExample: /setmin abc123 0.5", parse_mode=None)
         return
     
     monitor_id = args[1]
-    try:
-        min_percentage = float(args[2])
-        if min_percentage <= 0:
-            await message.answer("❌ Minimum percentage must be greater than 0")
-            return
-    except ValueError:
+    match = _PCT_RE.match(args[2])
+    if not match:
         await message.answer("❌ Invalid percentage value. Please enter a valid number")
         return
+    min_percentage = float(match.group(1))
+    if min_percentage <= 0:
+        await message.answer("❌ Minimum percentage must be greater than 0")
+        return
     
     # Ensure MonitorService is initialized
     _ensure_monitor_service()
@@ -646,5 +662,4 @@ def _ensure_monitor_service():
     """Ensure that the monitor service is initialized"""
     global monitor_service
     if monitor_service is None:
-        from services.monitor_service import MonitorService
         monitor_service = MonitorService() 
\ No newline at end of file
@@ -1,11 +1,20 @@
+import functools
 import os
+import re
+from urllib.parse import urlparse
 from dotenv import load_dotenv
-from typing import Dict
+from typing import Dict, Optional
+
+# Telegram accepts secret tokens of 1-256 characters from this set
+WEBHOOK_SECRET_RE = re.compile(r"^[A-Za-z0-9_-]{1,256}$")
 
 class ConfigManager:
     load_dotenv()
 
+    # Values below are read once per process; the environment is loaded at import
+
     @staticmethod
+    @functools.lru_cache(maxsize=1)
     def get_bot_token() -> str:
         token = os.getenv('ADMIN_BOT_TOKEN')
         if not token:
@@ -18,6 +27,35 @@ class ConfigManager:
         return ConfigManager.get_bot_token()
 
     @staticmethod
+    def get_webhook_settings() -> Optional[dict]:
+        """Webhook settings, or None when WEBHOOK_URL is unset and the bot should poll"""
+        webhook_url = os.getenv('WEBHOOK_URL')
+        if not webhook_url:
+            return None
+        # The endpoint is public, so only updates carrying the secret may reach the handlers
+        secret = os.getenv('WEBHOOK_SECRET')
+        if not secret:
+            raise ValueError("WEBHOOK_SECRET not found in environment variables")
+        if not WEBHOOK_SECRET_RE.match(secret):
+            raise ValueError("Invalid WEBHOOK_SECRET format: use 1-256 characters from A-Z, a-z, 0-9, _ and -")
+        port = os.getenv('WEBAPP_PORT', '8080')
+        try:
+            port = int(port)
+        except ValueError:
+            raise ValueError(f"Invalid WEBAPP_PORT format: {port}")
+        # Serve and register the same URL, adding the default path when none is given
+        parsed = urlparse(webhook_url)
+        path = parsed.path or '/webhook'
+        return {
+            'url': parsed._replace(path=path).geturl(),
+            'path': path,
+            'secret': secret,
+            'host': os.getenv('WEBAPP_HOST', '0.0.0.0'),
+            'port': port
+        }
+
+    @staticmethod
+    @functools.lru_cache(maxsize=1)
     def get_alert_group_id() -> int:
         group_id = os.getenv('ALERT_GROUP_ID')
         if not group_id:
@@ -28,11 +66,17 @@ class ConfigManager:
             raise ValueError(f"Invalid ALERT_GROUP_ID format: {group_id}")
 
     @staticmethod
-    def get_admin_user_ids() -> list[int]:
+    @functools.lru_cache(maxsize=1)
+    def get_admin_user_ids() -> frozenset[int]:
         admin_ids = os.getenv('ADMIN_USER_IDS', '')
         if not admin_ids:
             raise ValueError("ADMIN_USER_IDS not found in environment variables")
-        return [int(id.strip()) for id in admin_ids.split(',')]
+        return frozenset(int(id.strip()) for id in admin_ids.split(','))
+
+    @staticmethod
+    def invalidate_admins() -> None:
+        """Drop the cached admin IDs so the next lookup re-reads ADMIN_USER_IDS"""
+        ConfigManager.get_admin_user_ids.cache_clear()
 
     @staticmethod
     def get_mexc_credentials() -> dict:
@@ -1,40 +1,154 @@
 from abc import ABC, abstractmethod
-import requests
+from functools import cached_property
+import asyncio
+import ssl
+import aiohttp
+import orjson
 from typing import Dict, Any, Optional
 
+# Responses worth retrying: rate limiting and transient server errors
+RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+RETRY_BACKOFF = 0.1  # seconds, doubled on each attempt
+
+# Loading the system CA bundle is costly, so every session shares one context
+SSL_CONTEXT = ssl.create_default_context()
+
+
+def create_client_session(limit: int = 100, limit_per_host: int = 0, ttl_dns_cache: int = 300,
+                          keepalive_timeout: float = 75, **session_kwargs) -> aiohttp.ClientSession:
+    """
+    Create an aiohttp session backed by a pooled keep-alive connector using the shared SSL context.
+
+    Args:
+        limit: Maximum number of simultaneous connections
+        limit_per_host: Maximum connections to a single host, 0 for no limit
+        ttl_dns_cache: Seconds to cache DNS lookups
+        keepalive_timeout: Seconds to keep idle connections open
+        **session_kwargs: Extra arguments passed to ClientSession
+
+    Returns:
+        New aiohttp.ClientSession
+    """
+    connector = aiohttp.TCPConnector(
+        limit=limit,
+        limit_per_host=limit_per_host,
+        ttl_dns_cache=ttl_dns_cache,
+        keepalive_timeout=keepalive_timeout,
+        ssl=SSL_CONTEXT
+    )
+    return aiohttp.ClientSession(connector=connector, **session_kwargs)
+
+
+async def fetch_json(session: aiohttp.ClientSession, url: str, params: Optional[Dict] = None,
+                     headers: Optional[Dict] = None, retries: int = 3, timeout: float = 3) -> Any:
+    """
+    GET a URL and decode its JSON body with a bounded timeout.
+    Timeouts, connection errors, 429 and 5xx responses are retried with exponential backoff.
+
+    Args:
+        session: Session to send the request on
+        url: Request URL
+        params: Optional query parameters
+        headers: Optional request headers
+        retries: Total number of attempts
+        timeout: Total seconds allowed per attempt
+
+    Returns:
+        Decoded JSON response
+
+    Raises:
+        aiohttp.ClientResponseError: On a non-retryable error status, or when retries run out
+        asyncio.TimeoutError, aiohttp.ClientConnectionError: When the last attempt fails
+    """
+    client_timeout = aiohttp.ClientTimeout(total=timeout)
+    for attempt in range(retries):
+        last_attempt = attempt == retries - 1
+        try:
+            async with session.get(url, params=params, headers=headers, timeout=client_timeout) as response:
+                if last_attempt or response.status not in RETRYABLE_STATUSES:
+                    response.raise_for_status()
+                    return orjson.loads(await response.read())
+        except (asyncio.TimeoutError, aiohttp.ClientConnectionError):
+            if last_attempt:
+                raise
+        await asyncio.sleep(RETRY_BACKOFF * 2 ** attempt)
+
+
 class BaseAPIClient(ABC):
     def __init__(self, api_key: str, secret_key: str):
         self.api_key = api_key
         self.secret_key = secret_key
+        self.session: Optional[aiohttp.ClientSession] = None
+
+    async def ensure_session(self) -> aiohttp.ClientSession:
+        """Create the shared aiohttp session on first use"""
+        if self.session is None or self.session.closed:
+            self.session = create_client_session()
+        return self.session
+
+    async def close(self):
+        """Close the shared aiohttp session, if one was opened"""
+        if self.session is not None and not self.session.closed:
+            await self.session.close()
+        self.session = None
+
+    async def _get_json(self, url: str, params: Optional[Dict] = None, headers: Optional[Dict] = None,
+                        retries: int = 3, timeout: float = 3) -> Any:
+        """GET JSON on the shared session with timeout and retries, see fetch_json"""
+        await self.ensure_session()
+        return await fetch_json(self.session, url, params=params, headers=headers,
+                                retries=retries, timeout=timeout)
 
     @abstractmethod
     def get_headers(self) -> Dict[str, str]:
         pass
 
+    @cached_property
+    def _headers(self) -> Dict[str, str]:
+        """
+        get_headers() built once per client. Only valid for clients whose headers
+        depend solely on their credentials; treat the dict as read-only.
+        """
+        return self.get_headers()
+
     @abstractmethod
-    def get_futures_price(self, symbol: str) -> float:
+    async def get_futures_price(self, symbol: str) -> float:
         pass
 
     @abstractmethod
-    def get_spot_price(self, symbol: str) -> float:
+    async def get_spot_price(self, symbol: str) -> float:
         pass
 
     @abstractmethod
-    def check_token_availability(self, symbol: str) -> Dict[str, bool]:
+    async def check_token_availability(self, symbol: str) -> Dict[str, bool]:
         """
         Check if a token is available for deposit and withdrawal.
-        
+
         Args:
             symbol: The token symbol to check
-            
+
         Returns:
             Dict with keys 'deposit' and 'withdrawal', each with boolean values
             indicating availability status
         """
         pass
 
-    def make_request(self, method: str, url: str, headers: Optional[Dict] = None, 
-                    params: Optional[Dict] = None) -> requests.Response:
-        headers = headers or self.get_headers()
-        return requests.request(method, url, headers=headers, params=params) 
-    
\ No newline at end of file
+    async def make_request(self, method: str, url: str, headers: Optional[Dict] = None,
+                           params: Optional[Dict] = None) -> Any:
+        """
+        Make an HTTP request on the shared session and return the decoded JSON body.
+
+        Args:
+            method: HTTP method (GET, POST, etc.)
+            url: Request URL
+            headers: Optional headers, defaults to the cached client headers
+            params: Optional query parameters
+
+        Returns:
+            Decoded JSON response
+        """
+        headers = headers or self._headers
+        # Subclasses may override ensure_session without returning the session
+        await self.ensure_session()
+        async with self.session.request(method, url, headers=headers, params=params) as response:
+            return await response.json(loads=orjson.loads)
@@ -127,7 +127,7 @@ class BinanceClient(BaseAPIClient):
         """Check if a token is available for deposit and withdrawal"""
         try:
             # Generate timestamp and signature for authenticated endpoint
-            timestamp = str(int(time.time() * 1000))
+            timestamp = str(time.time_ns() // 1_000_000)
             query_string = f"timestamp={timestamp}"
             signature = self.generate_signature(query_string)
             
@@ -139,7 +139,7 @@ class BinanceClient(BaseAPIClient):
             }
             
             await self.ensure_session()
-            headers = self.get_headers()
+            headers = self._headers
             
             async with self.session.get(url, headers=headers, params=params) as response:
                 if response.status == 200:
@@ -206,7 +206,7 @@ class BinanceClient(BaseAPIClient):
         """
         try:
             # Generate timestamp and signature for authenticated endpoint
-            timestamp = str(int(time.time() * 1000))
+            timestamp = str(time.time_ns() // 1_000_000)
             query_string = f"timestamp={timestamp}"
             signature = self.generate_signature(query_string)
             
@@ -218,7 +218,7 @@ class BinanceClient(BaseAPIClient):
             }
             
             await self.ensure_session()
-            headers = self.get_headers()
+            headers = self._headers
             
             async with self.session.get(url, headers=headers, params=params) as response:
                 if response.status == 200:
@@ -6,7 +6,6 @@ import logging
 from typing import Dict, Any, Optional, List, Tuple
 
 import aiohttp
-import requests
 
 from exchanges.base_client import BaseAPIClient
 
@@ -75,7 +74,7 @@ class BingxClient(BaseAPIClient):
         """
         params = params or {}
         params.update({
-            "timestamp": int(time.time() * 1000),
+            "timestamp": time.time_ns() // 1_000_000,
             "recvWindow": 5000
         })
         return params
@@ -123,36 +122,6 @@ class BingxClient(BaseAPIClient):
         params["signature"] = signature
         return params
     
-    def make_request(self, method: str, url: str, params: Optional[Dict] = None, is_signed: bool = False) -> requests.Response:
-        """
-        Make HTTP request with appropriate headers and parameters
-        
-        Args:
-            method: HTTP method (GET, POST, etc.)
-            url: request URL
-            params: request parameters
-            is_signed: whether request requires authentication
-            
-        Returns:
-            HTTP response
-        """
-        headers = self.get_headers()
-        
-        if is_signed:
-            params = self.prepare_params(params)
-            
-            if method.upper() == 'GET':
-                params = self.sign_query_params(params)
-                response = requests.request(method, url, headers=headers, params=params)
-            else:
-                params = self.sign_request_body(params)
-                headers["Content-Type"] = "application/json"
-                response = requests.request(method, url, headers=headers, json=params)
-        else:
-            response = requests.request(method, url, headers=headers, params=params)
-            
-        return response
-    
     async def make_request_async(self, method: str, url: str, params: Optional[Dict] = None, is_signed: bool = False) -> Dict[str, Any]:
         """
         Make asynchronous HTTP request
@@ -167,7 +136,7 @@ class BingxClient(BaseAPIClient):
             JSON response
         """
         await self.ensure_session()
-        headers = self.get_headers()
+        headers = self._headers
         
         try:
             if is_signed:
@@ -184,7 +153,7 @@ class BingxClient(BaseAPIClient):
                             return {"error": f"Received non-JSON response: {response.status}", "data": []}
                 else:
                     params = self.sign_request_body(params)
-                    headers["Content-Type"] = "application/json"
+                    headers = {**headers, "Content-Type": "application/json"}
                     async with self.session.request(method, url, headers=headers, json=params) as response:
                         if response.content_type == 'application/json':
                             return await response.json()
@@ -1,13 +1,22 @@
-import aiohttp
+import asyncio
+import orjson
 import logging
+import time
+import aiohttp
 from ..base_client import BaseAPIClient
-from typing import Dict, Any, List, Tuple
+from typing import Callable, Dict, Any, List, Tuple
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)
 
 class BitgetClient(BaseAPIClient):
     BASE_URL = "https://api.bitget.com/api/v2/spot/public"
+    WS_URL = "wss://ws.bitget.com/v2/ws/public"
+    # Bitget drops connections that send no "ping" for 2 minutes
+    WS_PING_INTERVAL = 25
+    WS_RECONNECT_DELAY = 5
+    # The full coin list is large, so it gets more time than price calls
+    COIN_LIST_TIMEOUT = 10
 
     def __init__(self, api_key: str, api_secret: str):
         super().__init__(api_key, api_secret)
@@ -24,15 +33,13 @@ class BitgetClient(BaseAPIClient):
         }
 
     async def get_spot_price(self, symbol: str) -> float:
-        async with aiohttp.ClientSession() as session:
-            url = "https://api.bitget.com/api/v2/spot/market/tickers"
-            params = {'symbol': f"{symbol}USDT"}
-            
-            async with session.get(url, params=params) as response:
-                data = await response.json()
-                if data['code'] == '00000' and data['data']:
-                    return float(data['data'][0]['lastPr'])
-                raise Exception(f"Failed to get spot price: {data['msg']}")
+        url = "https://api.bitget.com/api/v2/spot/market/tickers"
+        params = {'symbol': f"{symbol}USDT"}
+
+        data = await self._get_json(url, params=params)
+        if data['code'] == '00000' and data['data']:
+            return float(data['data'][0]['lastPr'])
+        raise Exception(f"Failed to get spot price: {data['msg']}")
 
     async def get_futures_price(self, symbol: str) -> float:
         """
@@ -44,18 +51,16 @@ class BitgetClient(BaseAPIClient):
         Returns:
             float: The current futures price
         """
-        async with aiohttp.ClientSession() as session:
-            url = "https://api.bitget.com/api/v2/mix/market/ticker"
-            params = {
-                'productType': 'USDT-FUTURES',
-                'symbol': f"{symbol}USDT"
-            }
-            
-            async with session.get(url, params=params) as response:
-                data = await response.json()
-                if data['code'] == '00000' and data['data']:
-                    return float(data['data'][0]['lastPr'])
-                raise Exception(f"Failed to get futures price: {data['msg']}")
+        url = "https://api.bitget.com/api/v2/mix/market/ticker"
+        params = {
+            'productType': 'USDT-FUTURES',
+            'symbol': f"{symbol}USDT"
+        }
+
+        data = await self._get_json(url, params=params)
+        if data['code'] == '00000' and data['data']:
+            return float(data['data'][0]['lastPr'])
+        raise Exception(f"Failed to get futures price: {data['msg']}")
                 
     async def check_token_availability(self, symbol: str) -> Dict[str, bool]:
         """
@@ -68,26 +73,24 @@ class BitgetClient(BaseAPIClient):
             Dict with keys 'deposit' and 'withdrawal', each with boolean values
             indicating availability status
         """
-        async with aiohttp.ClientSession() as session:
-            url = "https://api.bitget.com/api/v2/spot/public/coins"
-            
-            try:
-                async with session.get(url) as response:
-                    data = await response.json()
-                    if data['code'] == '00000' and data['data']:
-                        for coin in data['data']:
-                            if coin.get('coin') == symbol.upper():
-                                return {
-                                    "deposit": coin.get('depositStatus', '0') == '1',
-                                    "withdrawal": coin.get('withdrawStatus', '0') == '1'
-                                }
-                        # Token not found
-                        return {"deposit": False, "withdrawal": False}
-                    else:
-                        return {"deposit": False, "withdrawal": False}
-            except Exception as e:
-                logger.error(f"Error checking token availability on Bitget: {e}")
+        url = "https://api.bitget.com/api/v2/spot/public/coins"
+        
+        try:
+            data = await self._get_json(url, timeout=self.COIN_LIST_TIMEOUT)
+            if data['code'] == '00000' and data['data']:
+                for coin in data['data']:
+                    if coin.get('coin') == symbol.upper():
+                        return {
+                            "deposit": coin.get('depositStatus', '0') == '1',
+                            "withdrawal": coin.get('withdrawStatus', '0') == '1'
+                        }
+                # Token not found
+                return {"deposit": False, "withdrawal": False}
+            else:
                 return {"deposit": False, "withdrawal": False}
+        except Exception as e:
+            logger.error(f"Error checking token availability on Bitget: {e}")
+            return {"deposit": False, "withdrawal": False}
     
     async def get_currency_chains(self, currency: str) -> List[Tuple[str, str]]:
         """
@@ -99,29 +102,85 @@ class BitgetClient(BaseAPIClient):
         Returns:
             List of tuples (network_name, contract_address)
         """
-        async with aiohttp.ClientSession() as session:
-            url = "https://api.bitget.com/api/v2/spot/public/coins"
-            
+        url = "https://api.bitget.com/api/v2/spot/public/coins"
+        
+        try:
+            data = await self._get_json(url, timeout=self.COIN_LIST_TIMEOUT)
+            if data['code'] == '00000' and data['data']:
+                result = []
+                for coin in data['data']:
+                    if coin.get('coin') == currency.upper():
+                        # Extract chain information
+                        chains = coin.get('chains', [])
+                        for chain in chains:
+                            chain_name = chain.get('chain', '')
+                            contract_address = chain.get('contractAddress', '')
+                            # Only include chains with necessary information
+                            if chain_name:
+                                result.append((chain_name, contract_address))
+                        break
+                return result
+            else:
+                return []
+        except Exception as e:
+            logger.error(f"Error getting currency chains on Bitget: {e}")
+            return []
+
+    async def stream_tickers(self, symbols: List[str], on_update: Callable[[str, float], None],
+                             market_type: str = "spot"):
+        """
+        Stream ticker updates from the public WebSocket until cancelled.
+        Reconnects after connection errors.
+
+        Args:
+            symbols: Trading symbols without USDT suffix (e.g., 'BTC')
+            on_update: Called with (symbol, last_price) on every ticker push
+            market_type: "spot" or "futures"
+        """
+        inst_type = "USDT-FUTURES" if market_type == "futures" else "SPOT"
+        subscribe = {
+            "op": "subscribe",
+            "args": [
+                {"instType": inst_type, "channel": "ticker", "instId": f"{symbol}USDT"}
+                for symbol in symbols
+            ]
+        }
+
+        while True:
             try:
-                async with session.get(url) as response:
-                    data = await response.json()
-                    if data['code'] == '00000' and data['data']:
-                        result = []
-                        for coin in data['data']:
-                            if coin.get('coin') == currency.upper():
-                                # Extract chain information
-                                chains = coin.get('chains', [])
-                                for chain in chains:
-                                    chain_name = chain.get('chain', '')
-                                    contract_address = chain.get('contractAddress', '')
-                                    # Only include chains with necessary information
-                                    if chain_name:
-                                        result.append((chain_name, contract_address))
-                                break
-                        return result
-                    else:
-                        return []
+                session = await self.ensure_session()
+                async with session.ws_connect(self.WS_URL) as ws:
+                    await ws.send_json(subscribe)
+                    last_ping = time.monotonic()
+
+                    while True:
+                        if time.monotonic() - last_ping >= self.WS_PING_INTERVAL:
+                            await ws.send_str("ping")
+                            last_ping = time.monotonic()
+
+                        try:
+                            msg = await ws.receive(timeout=self.WS_PING_INTERVAL)
+                        except asyncio.TimeoutError:
+                            continue
+
+                        if msg.type in (aiohttp.WSMsgType.CLOSE, aiohttp.WSMsgType.CLOSED, aiohttp.WSMsgType.ERROR):
+                            break
+                        if msg.type != aiohttp.WSMsgType.TEXT or msg.data == "pong":
+                            continue
+
+                        payload = orjson.loads(msg.data)
+                        if payload.get("event") == "error":
+                            logger.error("Bitget %s ticker subscription error: %s", market_type, payload)
+                            continue
+
+                        for ticker in payload.get("data") or []:
+                            inst_id = ticker.get("instId", "")
+                            last_price = ticker.get("lastPr")
+                            if inst_id.endswith("USDT") and last_price:
+                                on_update(inst_id[:-4], float(last_price))
+            except asyncio.CancelledError:
+                raise
             except Exception as e:
-                logger.error(f"Error getting currency chains on Bitget: {e}")
-                return []
-            
\ No newline at end of file
+                logger.error("Bitget %s ticker stream error: %s", market_type, e)
+
+            await asyncio.sleep(self.WS_RECONNECT_DELAY)
@@ -34,7 +34,7 @@ class BybitClient(BaseAPIClient):
 
     def get_timestamp(self) -> str:
         """Get current timestamp in milliseconds"""
-        return str(int(time.time() * 1000))
+        return str(time.time_ns() // 1_000_000)
 
     def generate_signature(self, timestamp: str, params: str) -> str:
         """
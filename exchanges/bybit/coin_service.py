@@ -2,26 +2,56 @@ from typing import Dict, Any, Optional, List
 from ..base_coin_service import BaseCoinService
 
 class BybitCoinService(BaseCoinService):
+    def __init__(self):
+        # Lookup indexes for the most recently searched response
+        self._indexed_data = None
+        self._name_index: Dict[str, Dict] = {}
+        self._contract_index: Dict[str, Dict] = {}
+
+    def invalidate_index(self):
+        """Drop cached lookup indexes, e.g. after mutating a response in place"""
+        self._indexed_data = None
+        self._name_index = {}
+        self._contract_index = {}
+
+    def _build_indexes(self, data: Dict):
+        """Index coins by name/coin and by chainType/contract, keeping the first match"""
+        name_index: Dict[str, Dict] = {}
+        contract_index: Dict[str, Dict] = {}
+
+        for coin in data['result']['list']:
+            for key in (coin.get('name'), coin.get('coin')):
+                if key is not None:
+                    name_index.setdefault(key, coin)
+            for chain in coin.get('chains', []):
+                for key in (chain.get('chainType'), chain.get('contract')):
+                    if key is not None:
+                        contract_index.setdefault(key, coin)
+
+        # Holding a reference to data keeps the identity check below reliable
+        self._indexed_data = data
+        self._name_index = name_index
+        self._contract_index = contract_index
+
+    def _ensure_indexes(self, data: Dict) -> bool:
+        """Build indexes for data unless they are already current; False if there is nothing to index"""
+        if not data.get('result', {}).get('list'):
+            return False
+        if data is not self._indexed_data:
+            self._build_indexes(data)
+        return True
+
     def search_by_name(self, data: List[Dict], name: str) -> Optional[Dict]:
         """Search for a coin by its name in the Bybit response data"""
-        if not data.get('result', {}).get('list'):
+        if not self._ensure_indexes(data):
             return None
-            
-        for coin in data['result']['list']:
-            if coin.get('name') == name or coin.get('coin') == name:
-                return coin
-        return None
+        return self._name_index.get(name)
 
     def search_by_contract(self, data: List[Dict], contract: str) -> Optional[Dict]:
         """Search for a coin by its contract address in the Bybit response data"""
-        if not data.get('result', {}).get('list'):
+        if not self._ensure_indexes(data):
             return None
-            
-        for coin in data['result']['list']:
-            for chain in coin.get('chains', []):
-                if chain.get('chainType') == contract or chain.get('contract') == contract:
-                    return coin
-        return None
+        return self._contract_index.get(contract)
 
     def format_coin_info(self, coin: Optional[Dict]) -> str:
         """Format coin information for display"""
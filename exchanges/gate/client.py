@@ -1,38 +1,66 @@
+import asyncio
 import aiohttp
+import orjson
 import logging
-from typing import Dict, Any, List, Optional, Tuple
+import time
+from typing import Callable, Dict, Any, List, Optional, Tuple
+from ..base_client import create_client_session, fetch_json
 
 class GateClient:
+    SPOT_WS_URL = "wss://api.gateio.ws/ws/v4/"
+    FUTURES_WS_URL = "wss://fx-ws.gateio.ws/v4/ws/usdt"
+    WS_HEARTBEAT = 20
+    WS_RECONNECT_DELAY = 5
+    # Listing every USDT contract is a large response, so it gets more time than price calls
+    CONTRACT_LIST_TIMEOUT = 10
+
     def __init__(self):
         self.base_url = "https://api.gateio.ws/api/v4"
+        self.session: Optional[aiohttp.ClientSession] = None
+        self._headers = self._get_headers()
+
+    async def ensure_session(self) -> aiohttp.ClientSession:
+        """Create the shared aiohttp session on first use"""
+        if self.session is None or self.session.closed:
+            self.session = create_client_session()
+        return self.session
+
+    async def close(self):
+        """Close the shared aiohttp session, if one was opened"""
+        if self.session is not None and not self.session.closed:
+            await self.session.close()
+        self.session = None
+
+    async def _get_json(self, url: str, params: Optional[Dict] = None, timeout: float = 3) -> Any:
+        """GET JSON on the shared session with timeout and retries, see fetch_json"""
+        session = await self.ensure_session()
+        return await fetch_json(session, url, params=params, headers=self._headers, timeout=timeout)
 
     async def get_futures_contracts(self) -> List[Dict[str, Any]]:
-        async with aiohttp.ClientSession(headers=self._get_headers()) as session:
-            url = f"{self.base_url}/futures/usdt/contracts"
-            async with session.get(url) as response:
-                return await response.json()
+        url = f"{self.base_url}/futures/usdt/contracts"
+        return await self._get_json(url, timeout=self.CONTRACT_LIST_TIMEOUT)
 
     async def get_futures_price(self, symbol: str) -> Optional[float]:
-        contracts = await self.get_futures_contracts()
-        contract_name = f"{symbol}_USDT"
-        
-        for contract in contracts:
-            if contract.get('name') == contract_name:
-                return float(contract.get('mark_price', 0))
-                
-        return None
+        # Query the single contract instead of scanning the full contract list
+        url = f"{self.base_url}/futures/usdt/contracts/{symbol}_USDT"
+        try:
+            contract = await self._get_json(url)
+        except aiohttp.ClientResponseError:
+            # Gate answers unknown contracts with a 4xx error body
+            return None
+        return float(contract.get('mark_price', 0))
 
     async def get_spot_price(self, symbol: str) -> Optional[float]:
-        async with aiohttp.ClientSession(headers=self._get_headers()) as session:
-            currency_pair = f"{symbol}_USDT"
-            url = f"{self.base_url}/spot/tickers?currency_pair={currency_pair}"
-            async with session.get(url) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    if data and isinstance(data, list) and len(data) > 0:
-                        # Return last price from the first matching ticker
-                        return float(data[0].get('last', 0))
-                return None
+        currency_pair = f"{symbol}_USDT"
+        url = f"{self.base_url}/spot/tickers"
+        try:
+            data = await self._get_json(url, params={"currency_pair": currency_pair})
+        except aiohttp.ClientResponseError:
+            return None
+        if data and isinstance(data, list) and len(data) > 0:
+            # Return last price from the first matching ticker
+            return float(data[0].get('last', 0))
+        return None
 
     def format_market_price(self, price: Optional[float], symbol: str) -> str:
         if price is None:
@@ -68,43 +96,40 @@ class GateClient:
             Dict with keys 'deposit' and 'withdrawal', each with boolean values
             indicating availability status
         """
-        async with aiohttp.ClientSession(headers=self._get_headers()) as session:
-            url = f"{self.base_url}/wallet/currency_chains"
-            params = {"currency": symbol}
+        url = f"{self.base_url}/wallet/currency_chains"
+        params = {"currency": symbol}
+        
+        try:
+            data = await self._get_json(url, params=params)
             
-            try:
-                async with session.get(url, params=params) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        
-                        # Initialize with unavailable status
-                        deposit_available = False
-                        withdrawal_available = False
-                        
-                        # Check all chains for the currency
-                        for chain in data:
-                            # If any chain has deposits enabled (is_deposit_disabled=0), mark deposits as available
-                            if chain.get("is_deposit_disabled", 1) == 0:
-                                deposit_available = True
-                                
-                            # If any chain has withdrawals enabled (is_withdraw_disabled=0), mark withdrawals as available
-                            if chain.get("is_withdraw_disabled", 1) == 0:
-                                withdrawal_available = True
-                                
-                            # If both are already available, we can stop checking
-                            if deposit_available and withdrawal_available:
-                                break
-                                
-                        return {
-                            "deposit": deposit_available,
-                            "withdrawal": withdrawal_available
-                        }
-                    else:
-                        logging.error(f"Error checking token availability for {symbol}: Status {response.status}")
-                        return {"deposit": False, "withdrawal": False}
-            except Exception as e:
-                logging.error(f"Error checking token availability for {symbol}: {e}")
-                return {"deposit": False, "withdrawal": False}
+            # Initialize with unavailable status
+            deposit_available = False
+            withdrawal_available = False
+            
+            # Check all chains for the currency
+            for chain in data:
+                # If any chain has deposits enabled (is_deposit_disabled=0), mark deposits as available
+                if chain.get("is_deposit_disabled", 1) == 0:
+                    deposit_available = True
+                    
+                # If any chain has withdrawals enabled (is_withdraw_disabled=0), mark withdrawals as available
+                if chain.get("is_withdraw_disabled", 1) == 0:
+                    withdrawal_available = True
+                    
+                # If both are already available, we can stop checking
+                if deposit_available and withdrawal_available:
+                    break
+                    
+            return {
+                "deposit": deposit_available,
+                "withdrawal": withdrawal_available
+            }
+        except aiohttp.ClientResponseError as e:
+            logging.error(f"Error checking token availability for {symbol}: Status {e.status}")
+            return {"deposit": False, "withdrawal": False}
+        except Exception as e:
+            logging.error(f"Error checking token availability for {symbol}: {e}")
+            return {"deposit": False, "withdrawal": False}
 
     async def get_currency_chains(self, currency: str) -> List[Tuple[str, str]]:
         """
@@ -116,57 +141,108 @@ class GateClient:
         """
         logging.debug(f"Fetching currency chains for {currency}")
         try:
-            async with aiohttp.ClientSession(headers=self._get_headers()) as session:
-                url = f"{self.base_url}/spot/currencies/{currency}"
-                logging.debug(f"Making request to {url}")
-                async with session.get(url) as response:
-                    if response.status == 200:
-                        try:
-                            data = await response.json()
-                            logging.debug(f"Raw API response for {currency}: {data}")
-                            
-                            if not isinstance(data, dict):
-                                logging.error(f"Unexpected response format for {currency}: {type(data)}, value: {data}")
-                                return []
-                                
-                            chains = data.get('chains', [])
-                            logging.debug(f"Extracted chains data for {currency}: {chains}")
-                            
-                            if not isinstance(chains, list):
-                                logging.error(f"Unexpected chains format for {currency}: type: {type(chains)}, value: {chains}")
-                                return []
-                                
-                            logging.debug(f"Found {len(chains)} chains for {currency}")
-                            result = []
-                            for idx, chain in enumerate(chains):
-                                logging.debug(f"Processing chain {idx + 1}/{len(chains)} for {currency}: {chain}")
-                                
-                                if not isinstance(chain, dict):
-                                    logging.warning(f"Invalid chain format at index {idx}: type: {type(chain)}, value: {chain}")
-                                    continue
-                                    
-                                chain_name = chain.get('name')
-                                addr = chain.get('addr')
-                                logging.debug(f"Chain {idx + 1} data - name: {chain_name} ({type(chain_name)}), addr: {addr} ({type(addr)})")
-                                
-                                if chain_name and addr and isinstance(chain_name, str) and isinstance(addr, str):
-                                    result.append((chain_name, addr))
-                                    logging.debug(f"Added chain {chain_name} with address for {currency}")
-                                else:
-                                    logging.warning(f"Invalid chain data at index {idx} - name: {chain_name} ({type(chain_name)}), addr: {addr} ({type(addr)})")
-                                    
-                            logging.info(f"Successfully retrieved {len(result)} valid chains for {currency}. Final result: {result}")
-                            return result
-                        except Exception as e:
-                            logging.error(f"Error parsing response for {currency}: {str(e)}", exc_info=True)
-                            return []
-                    logging.warning(f"Failed to fetch currency chains for {currency}. Status code: {response.status}")
-                    try:
-                        error_body = await response.text()
-                        logging.warning(f"Error response body: {error_body}")
-                    except Exception as e:
-                        logging.warning(f"Could not read error response: {str(e)}")
+            url = f"{self.base_url}/spot/currencies/{currency}"
+            logging.debug(f"Making request to {url}")
+            try:
+                data = await self._get_json(url)
+            except aiohttp.ClientResponseError as e:
+                logging.warning(f"Failed to fetch currency chains for {currency}. Status code: {e.status}, message: {e.message}")
+                return []
+
+            try:
+                logging.debug(f"Raw API response for {currency}: {data}")
+                
+                if not isinstance(data, dict):
+                    logging.error(f"Unexpected response format for {currency}: {type(data)}, value: {data}")
+                    return []
+                    
+                chains = data.get('chains', [])
+                logging.debug(f"Extracted chains data for {currency}: {chains}")
+                
+                if not isinstance(chains, list):
+                    logging.error(f"Unexpected chains format for {currency}: type: {type(chains)}, value: {chains}")
                     return []
+                    
+                logging.debug(f"Found {len(chains)} chains for {currency}")
+                result = []
+                for idx, chain in enumerate(chains):
+                    logging.debug(f"Processing chain {idx + 1}/{len(chains)} for {currency}: {chain}")
+                    
+                    if not isinstance(chain, dict):
+                        logging.warning(f"Invalid chain format at index {idx}: type: {type(chain)}, value: {chain}")
+                        continue
+                        
+                    chain_name = chain.get('name')
+                    addr = chain.get('addr')
+                    logging.debug(f"Chain {idx + 1} data - name: {chain_name} ({type(chain_name)}), addr: {addr} ({type(addr)})")
+                    
+                    if chain_name and addr and isinstance(chain_name, str) and isinstance(addr, str):
+                        result.append((chain_name, addr))
+                        logging.debug(f"Added chain {chain_name} with address for {currency}")
+                    else:
+                        logging.warning(f"Invalid chain data at index {idx} - name: {chain_name} ({type(chain_name)}), addr: {addr} ({type(addr)})")
+                        
+                logging.info(f"Successfully retrieved {len(result)} valid chains for {currency}. Final result: {result}")
+                return result
+            except Exception as e:
+                logging.error(f"Error parsing response for {currency}: {str(e)}", exc_info=True)
+                return []
         except Exception as e:
             logging.error(f"Error in get_currency_chains for {currency}: {str(e)}", exc_info=True)
             return []
+
+    async def stream_tickers(self, symbols: List[str], on_update: Callable[[str, float], None],
+                             market_type: str = "spot"):
+        """
+        Stream ticker updates from the public WebSocket until cancelled.
+        Reconnects after connection errors.
+
+        Args:
+            symbols: Currency symbols (e.g., 'BTC')
+            on_update: Called with (symbol, price) on every ticker push; futures
+                report the mark price to match get_futures_price
+            market_type: "spot" or "futures"
+        """
+        if market_type == "futures":
+            url, channel = self.FUTURES_WS_URL, "futures.tickers"
+        else:
+            url, channel = self.SPOT_WS_URL, "spot.tickers"
+        pairs = [f"{symbol}_USDT" for symbol in symbols]
+
+        while True:
+            try:
+                session = await self.ensure_session()
+                async with session.ws_connect(url, heartbeat=self.WS_HEARTBEAT) as ws:
+                    await ws.send_json({
+                        "time": int(time.time()),
+                        "channel": channel,
+                        "event": "subscribe",
+                        "payload": pairs
+                    })
+
+                    async for msg in ws:
+                        if msg.type != aiohttp.WSMsgType.TEXT:
+                            continue
+
+                        payload = orjson.loads(msg.data)
+                        if payload.get("error"):
+                            logging.error("Gate %s ticker subscription error: %s", market_type, payload['error'])
+                            continue
+                        if payload.get("event") != "update":
+                            continue
+
+                        # Spot pushes a single ticker, futures pushes a list
+                        tickers = payload.get("result") or []
+                        if isinstance(tickers, dict):
+                            tickers = [tickers]
+                        for ticker in tickers:
+                            pair = ticker.get("currency_pair") or ticker.get("contract", "")
+                            price = ticker.get("mark_price") if market_type == "futures" else ticker.get("last")
+                            if pair.endswith("_USDT") and price:
+                                on_update(pair[:-5], float(price))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logging.error("Gate %s ticker stream error: %s", market_type, e)
+
+            await asyncio.sleep(self.WS_RECONNECT_DELAY)
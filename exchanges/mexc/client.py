@@ -1,14 +1,19 @@
+import asyncio
 import hmac
-import hashlib
 import time
-import requests
 import aiohttp
+import orjson
 import logging
+from urllib.parse import urlencode
 from typing import Dict, Any, Optional, List, Tuple
-from ..base_client import BaseAPIClient
+from ..base_client import BaseAPIClient, create_client_session
+from .models import Coin, COINS_DECODER
 
 logger = logging.getLogger(__name__)
-logger.setLevel(logging.DEBUG)
+
+REQUEST_TIMEOUT = aiohttp.ClientTimeout(total=10)
+# Prices younger than this are served to callers that arrive in the same burst
+PRICE_CACHE_TTL = 0.5
 
 class MexcClient(BaseAPIClient):
     BASE_URL = "https://api.mexc.com/api/v3"
@@ -16,60 +21,73 @@ class MexcClient(BaseAPIClient):
     def __init__(self, api_key: str, api_secret: str):
         self.api_key = api_key
         self.api_secret = api_secret
-        self.base_url = "https://api.mexc.com/api/v3"
+        # Signing key and auth headers never change for a client, build them once
+        self._api_secret_bytes = api_secret.encode('utf-8')
+        self._headers = {'x-mexc-apikey': api_key}
         self.session = None
+        # The coin/network list changes rarely, so serve it from memory for a while
+        self._all_coins_cache = None
+        self._all_coins_cache_ts = 0.0
+        self._all_coins_ttl = 30.0
+        # In-flight price lookups and recent results, keyed by (market, symbol)
+        self._inflight: Dict[Tuple[str, str], asyncio.Task] = {}
+        self._price_cache: Dict[Tuple[str, str], Tuple[float, float]] = {}
 
     async def __aenter__(self):
-        self.session = aiohttp.ClientSession()
+        await self.ensure_session()
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        if self.session:
-            await self.session.close()
+        await self.close()
             
     async def ensure_session(self):
-        if self.session is None:
-            self.session = aiohttp.ClientSession()
+        if self.session is None or self.session.closed:
+            self.session = create_client_session(
+                limit_per_host=20,
+                keepalive_timeout=60,
+                timeout=REQUEST_TIMEOUT
+            )
+        return self.session
 
     def generate_signature(self, params: str) -> str:
-        return hmac.new(
-            bytes(self.api_secret, 'utf-8'),
-            bytes(params, 'utf-8'),
-            hashlib.sha256
-        ).hexdigest()
+        # Single-shot HMAC runs entirely in OpenSSL, no Python-level HMAC object
+        return hmac.digest(self._api_secret_bytes, params.encode('utf-8'), 'sha256').hex()
 
     def get_headers(self) -> Dict[str, str]:
-        return {'x-mexc-apikey': self.api_key}
+        """Auth headers shared by every request, do not mutate the returned dict"""
+        return self._headers
+
+    def invalidate_all_coins(self):
+        """Force the next get_all_coins call to refetch from MEXC"""
+        self._all_coins_cache = None
+        self._all_coins_cache_ts = 0.0
+
+    async def get_all_coins(self) -> List[Coin]:
+        """Get all coins information including network details, cached for a short TTL"""
+        if (self._all_coins_cache is not None
+                and time.monotonic() - self._all_coins_cache_ts < self._all_coins_ttl):
+            return self._all_coins_cache
 
-    async def get_all_coins(self) -> Dict[str, Any]:
-        """Get all coins information including network details"""
-        timestamp = str(int(time.time() * 1000))
+        timestamp = str(time.time_ns() // 1_000_000)
         
-        query_string = f"recvWindow=5000&timestamp={timestamp}"
+        # urlencode escapes values and keeps insertion order, so signed params can be added here safely
+        query_string = urlencode({'recvWindow': '5000', 'timestamp': timestamp})
         signature = self.generate_signature(query_string)
+        # Send exactly the string that was signed rather than letting aiohttp re-encode a params dict
+        url = f"{self.BASE_URL}/capital/config/getall?{query_string}&signature={signature}"
         
-        params = {
-            'recvWindow': '5000',
-            'timestamp': timestamp,
-            'signature': signature
-        }
-        
-        url = f"{self.BASE_URL}/capital/config/getall"
-        
-        async with aiohttp.ClientSession() as session:
-            headers = self.get_headers()
-            async with session.get(url, params=params, headers=headers) as response:
-                if response.status != 200:
-                    logger.error(f"MEXC API error: {await response.text()}")
-                    return []
-                return await response.json()
+        await self.ensure_session()
+        async with self.session.get(url, headers=self.get_headers()) as response:
+            if response.status != 200:
+                logger.error("MEXC API error: %s", await response.text())
+                return []
+            coins = COINS_DECODER.decode(await response.read())
 
-    async def get_all_coins_async(self) -> Dict[str, Any]:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(f"{self.base_url}/exchangeInfo") as response:
-                return await response.json()
+        self._all_coins_cache = coins
+        self._all_coins_cache_ts = time.monotonic()
+        return coins
 
-    def parse_futures_price(self, symbol: str) -> Dict[str, Any]:
+    async def parse_futures_price(self, symbol: str) -> Dict[str, Any]:
         """
         Get the fair price for a futures contract.
         
@@ -80,8 +98,7 @@ class MexcClient(BaseAPIClient):
             Dict containing symbol, fair price, and timestamp
         """
         url = f"https://contract.mexc.com/api/v1/contract/fair_price/{symbol}_USDT"
-        response = self.make_request('GET', url)
-        data = response.json()
+        data = await self.make_request('GET', url)
         
         if not data.get('success'):
             raise Exception(f"Failed to get futures price: {data}")
@@ -92,7 +109,7 @@ class MexcClient(BaseAPIClient):
             'timestamp': data['data']['timestamp']
         }
 
-    def get_exchange_info(self, symbol: Optional[str] = None) -> Dict[str, Any]:
+    async def get_exchange_info(self, symbol: Optional[str] = None) -> Dict[str, Any]:
         """
         Get exchange information including trading rules and symbol information
         
@@ -104,27 +121,60 @@ class MexcClient(BaseAPIClient):
         """
         url = f"{self.BASE_URL}/exchangeInfo"
         params = {"symbol": symbol} if symbol else None
-        response = self.make_request('GET', url, params=params)
-        return response.json()
+        return await self.make_request('GET', url, params=params)
 
     async def get_spot_ticker(self, symbol: str) -> Dict[str, Any]:
         """Get spot market ticker"""
-        url = f"{self.base_url}/ticker/24hr"  # Removed duplicate api/v3
+        url = f"{self.BASE_URL}/ticker/24hr"
         params = {"symbol": symbol}
         try:
+            await self.ensure_session()
             async with self.session.get(url, params=params) as response:
                 if response.status != 200:
-                    logger.error(f"MEXC API error: {await response.text()}")
+                    logger.error("MEXC API error: %s", await response.text())
                     return None
-                data = await response.json()
+                data = await response.json(loads=orjson.loads)
                 return {"last": data["lastPrice"]} if "lastPrice" in data else None
         except Exception as e:
-            logger.error(f"Error fetching spot ticker: {str(e)}")
+            logger.error("Error fetching spot ticker: %s", e)
             return None
 
+    async def _coalesced_price(self, key: Tuple[str, str], fetch) -> Optional[float]:
+        """
+        Run a price lookup at most once at a time per key.
+        Concurrent callers share the in-flight request, and a successful
+        result is reused for PRICE_CACHE_TTL seconds.
+
+        Args:
+            key: (market, symbol) identifying the lookup
+            fetch: Zero-argument coroutine function performing the request
+
+        Returns:
+            The price, or None if the lookup failed
+        """
+        cached = self._price_cache.get(key)
+        if cached is not None and time.monotonic() - cached[0] < PRICE_CACHE_TTL:
+            return cached[1]
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(fetch())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._price_done(key, t))
+        # Shield so one cancelled caller doesn't cancel the request for the others
+        return await asyncio.shield(task)
+
+    def _price_done(self, key: Tuple[str, str], task: asyncio.Task):
+        self._inflight.pop(key, None)
+        if task.cancelled() or task.exception() is not None:
+            return
+        price = task.result()
+        if price is not None:
+            self._price_cache[key] = (time.monotonic(), price)
+
     async def get_futures_price(self, symbol: str) -> float:
         """
-        Get futures price for a symbol.
+        Get futures price for a symbol, sharing concurrent identical lookups.
         
         Args:
             symbol: Trading pair symbol (e.g. 'BTCUSDT')
@@ -132,6 +182,10 @@ class MexcClient(BaseAPIClient):
         Returns:
             float: Current price of the symbol
         """
+        return await self._coalesced_price(('futures', symbol), lambda: self._fetch_futures_price(symbol))
+
+    async def _fetch_futures_price(self, symbol: str) -> float:
+        """Fetch the futures price from the contract ticker list"""
         await self.ensure_session()
         
         try:
@@ -142,14 +196,14 @@ class MexcClient(BaseAPIClient):
             ticker_url = "https://contract.mexc.com/api/v1/contract/ticker"
             async with self.session.get(ticker_url) as response:
                 if response.status != 200:
-                    logger.error(f"MEXC API error: {await response.text()}")
+                    logger.error("MEXC API error: %s", await response.text())
                     return None
                 
-                ticker_data = await response.json()
-                logger.info(f"MEXC futures ticker data structure: {type(ticker_data)}")
+                ticker_data = await response.json(loads=orjson.loads)
+                logger.debug("MEXC futures ticker data structure: %s", type(ticker_data))
                 
                 if not ticker_data.get('success', False):
-                    logger.error(f"Failed to get futures ticker data: {ticker_data}")
+                    logger.error("Failed to get futures ticker data: %s", ticker_data)
                     return None
                 
                 # The data field contains the ticker information
@@ -164,25 +218,25 @@ class MexcClient(BaseAPIClient):
                                 return float(ticker.get("lastPrice", 0))
                         
                         # If we reach here, we didn't find the symbol
-                        logger.error(f"Symbol {formatted_symbol} not found in futures ticker data")
+                        logger.error("Symbol %s not found in futures ticker data", formatted_symbol)
                         return None
                     elif isinstance(data, dict):
                         # If it's a single object (maybe when querying a specific symbol)
                         if data.get("symbol") == formatted_symbol or "symbol" not in data:
                             return float(data.get("lastPrice", 0))
                         else:
-                            logger.error(f"Symbol mismatch in futures ticker data. Expected {formatted_symbol}, got {data.get('symbol')}")
+                            logger.error("Symbol mismatch in futures ticker data. Expected %s, got %s", formatted_symbol, data.get('symbol'))
                             return None
                 
-                logger.error(f"Unexpected response structure from MEXC futures ticker: {ticker_data}")
+                logger.error("Unexpected response structure from MEXC futures ticker: %s", ticker_data)
                 return None
         except Exception as e:
-            logger.error(f"Error fetching futures price: {str(e)}")
+            logger.error("Error fetching futures price: %s", e)
             return None
 
     async def get_spot_price(self, symbol: str) -> float:
         """
-        Get spot market price for a symbol paired with USDT.
+        Get spot market price for a symbol paired with USDT, sharing concurrent identical lookups.
         
         Args:
             symbol: Base currency symbol (e.g. 'BTC' for BTCUSDT pair)
@@ -190,6 +244,10 @@ class MexcClient(BaseAPIClient):
         Returns:
             float: Current price of the symbol
         """
+        return await self._coalesced_price(('spot', symbol), lambda: self._fetch_spot_price(symbol))
+
+    async def _fetch_spot_price(self, symbol: str) -> float:
+        """Fetch the spot price from the 24hr ticker endpoint"""
         symbol = f"{symbol}USDT"    
         url = f"{self.BASE_URL}/ticker/24hr"
         params = {"symbol": symbol}
@@ -198,13 +256,13 @@ class MexcClient(BaseAPIClient):
             await self.ensure_session()
             async with self.session.get(url, params=params, headers=self.get_headers()) as response:
                 if response.status != 200:
-                    logger.error(f"MEXC API error: {await response.text()}")
+                    logger.error("MEXC API error: %s", await response.text())
                     return None
-                data = await response.json()
-                logger.info(f"MEXC spot price for {symbol}: {data}")
+                data = await response.json(loads=orjson.loads)
+                logger.debug("MEXC spot price for %s: %s", symbol, data)
                 return float(data["lastPrice"])
         except Exception as e:
-            logger.error(f"Error fetching spot price for {symbol}: {str(e)}")
+            logger.error("Error fetching spot price for %s: %s", symbol, e)
             return None
 
     async def check_token_availability(self, symbol: str) -> Dict[str, bool]:
@@ -218,72 +276,48 @@ class MexcClient(BaseAPIClient):
             Dict with keys 'deposit' and 'withdrawal', each with boolean values
             indicating availability status
         """
-        # Ensure session exists
-        await self.ensure_session()
-        
         try:
-            # Get authenticated coin information
-            timestamp = str(int(time.time() * 1000))
-            
-            query_string = f"recvWindow=5000&timestamp={timestamp}"
-            signature = self.generate_signature(query_string)
-            
-            params = {
-                'recvWindow': '5000',
-                'timestamp': timestamp,
-                'signature': signature
-            }
-            
-            url = f"{self.BASE_URL}/capital/config/getall"
-            
-            headers = self.get_headers()
-            async with self.session.get(url, params=params, headers=headers) as response:
-                if response.status != 200:
-                    logger.error(f"MEXC API error: {await response.text()}")
-                    return {"deposit": False, "withdrawal": False}
-                
-                coins_info = await response.json()
-                logger.info(f"MEXC coins info retrieved successfully")
-                
-                # Search for the symbol in the coins_info
-                for coin in coins_info:
-                    if coin.get('coin') == symbol.upper():
-                        # Check if depositAllEnable/withdrawAllEnable exist at coin level
-                        if 'depositAllEnable' in coin and 'withdrawAllEnable' in coin:
-                            return {
-                                "deposit": coin.get('depositAllEnable', False),
-                                "withdrawal": coin.get('withdrawAllEnable', False)
-                            }
+            coins_info = await self.get_all_coins()
+
+            # Search for the symbol in the coins_info
+            for coin in coins_info:
+                if coin.coin == symbol.upper():
+                    # Check if depositAllEnable/withdrawAllEnable exist at coin level
+                    if coin.depositAllEnable is not None and coin.withdrawAllEnable is not None:
+                        return {
+                            "deposit": coin.depositAllEnable,
+                            "withdrawal": coin.withdrawAllEnable
+                        }
+                    
+                    # If not found at coin level, check networkList
+                    network_list = coin.networkList
+                    if network_list:
+                        # Consider a coin available if at least one network allows deposit/withdrawal
+                        deposit_available = False
+                        withdrawal_available = False
                         
-                        # If not found at coin level, check networkList
-                        network_list = coin.get('networkList', [])
-                        if network_list:
-                            # Consider a coin available if at least one network allows deposit/withdrawal
-                            deposit_available = False
-                            withdrawal_available = False
-                            
-                            for network in network_list:
-                                # Check if this network is for the correct coin
-                                if network.get('coin') == symbol.upper():
-                                    if network.get('depositEnable', False):
-                                        deposit_available = True
-                                    if network.get('withdrawEnable', False):
-                                        withdrawal_available = True
-                            
-                            return {
-                                "deposit": deposit_available,
-                                "withdrawal": withdrawal_available
-                            }
+                        for network in network_list:
+                            # Check if this network is for the correct coin
+                            if network.coin == symbol.upper():
+                                if network.depositEnable:
+                                    deposit_available = True
+                                if network.withdrawEnable:
+                                    withdrawal_available = True
                         
-                        # No network list found
-                        logger.warning(f"No network information found for {symbol}")
-                        return {"deposit": False, "withdrawal": False}
-                
-                # Symbol not found
-                logger.warning(f"Token {symbol} not found in MEXC")
-                return {"deposit": False, "withdrawal": False}
+                        return {
+                            "deposit": deposit_available,
+                            "withdrawal": withdrawal_available
+                        }
+                    
+                    # No network list found
+                    logger.warning("No network information found for %s", symbol)
+                    return {"deposit": False, "withdrawal": False}
+            
+            # Symbol not found
+            logger.warning("Token %s not found in MEXC", symbol)
+            return {"deposit": False, "withdrawal": False}
         except Exception as e:
-            logger.error(f"Error checking token availability for {symbol}: {e}")
+            logger.error("Error checking token availability for %s: %s", symbol, e)
             return {"deposit": False, "withdrawal": False}
 
     async def get_currency_chains(self, currency: str) -> List[Tuple[str, str]]:
@@ -296,54 +330,30 @@ class MexcClient(BaseAPIClient):
         Returns:
             List of tuples (network_name, contract_address)
         """
-        # Ensure session exists
-        await self.ensure_session()
-        
         try:
-            # Get authenticated coin information
-            timestamp = str(int(time.time() * 1000))
-            
-            query_string = f"recvWindow=5000&timestamp={timestamp}"
-            signature = self.generate_signature(query_string)
-            
-            params = {
-                'recvWindow': '5000',
-                'timestamp': timestamp,
-                'signature': signature
-            }
-            
-            url = f"{self.BASE_URL}/capital/config/getall"
-            
-            headers = self.get_headers()
-            async with self.session.get(url, params=params, headers=headers) as response:
-                if response.status != 200:
-                    logger.error(f"MEXC API error: {await response.text()}")
-                    return []
-                
-                coins_info = await response.json()
-                
-                # Search for the currency in the coins_info
-                for coin in coins_info:
-                    if coin.get('coin') == currency.upper():
-                        result = []
-                        
-                        # Extract network information
-                        networks = coin.get('networkList', [])
-                        for network in networks:
-                            network_name = network.get('network', '')
-                            contract_address = network.get('contractAddress', '')
-                            
-                            # Only include networks with the necessary information
-                            if network_name:
-                                result.append((network_name, contract_address))
+            coins_info = await self.get_all_coins()
+
+            # Search for the currency in the coins_info
+            for coin in coins_info:
+                if coin.coin == currency.upper():
+                    result = []
+                    
+                    # Extract network information
+                    for network in coin.networkList:
+                        network_name = network.network or ''
+                        contract_address = network.contractAddress or ''
                         
-                        return result
-                
-                # Currency not found
-                logger.warning(f"Currency {currency} not found in MEXC")
-                return []
+                        # Only include networks with the necessary information
+                        if network_name:
+                            result.append((network_name, contract_address))
+                    
+                    return result
+            
+            # Currency not found
+            logger.warning("Currency %s not found in MEXC", currency)
+            return []
         except Exception as e:
-            logger.error(f"Error getting currency chains for {currency}: {e}")
+            logger.error("Error getting currency chains for %s: %s", currency, e)
             return []
 
     # Add other async methods as needed 
\ No newline at end of file
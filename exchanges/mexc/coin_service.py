@@ -1,24 +1,25 @@
 from typing import Dict, Any, Optional, List
 from ..base_coin_service import BaseCoinService
+from .models import Coin
 
 class MexcCoinService(BaseCoinService):
-    def search_by_name(self, data: List[Dict], name: str) -> Optional[Dict]:
+    def search_by_name(self, data: List[Coin], name: str) -> Optional[Coin]:
         for coin in data:
-            if coin.get('coin') == name or coin.get('Name') == name:
+            if coin.coin == name or coin.name == name:
                 return coin
         return None
 
-    def search_by_contract(self, data: List[Dict], contract: str) -> Optional[Dict]:
+    def search_by_contract(self, data: List[Coin], contract: str) -> Optional[Coin]:
         for coin in data:
-            for network in coin.get('networkList', []):
-                if network.get('contract') == contract:
+            for network in coin.networkList:
+                if network.contract == contract:
                     return coin
         return None
 
-    def format_coin_info(self, coin: Optional[Dict]) -> str:
+    def format_coin_info(self, coin: Optional[Coin]) -> str:
         if not coin:
             return "Coin not found in the response"
 
-        output = [f"\nCoin Details:", f"Coin: {coin.get('Name', coin.get('coin'))}"]
-            
-        return "\n".join(output) 
\ No newline at end of file
+        output = [f"\nCoin Details:", f"Coin: {coin.name or coin.coin}"]
+
+        return "\n".join(output)
@@ -0,0 +1,29 @@
+from typing import List, Optional
+import msgspec
+
+
+class CoinNetwork(msgspec.Struct):
+    """One entry of a coin's networkList in /capital/config/getall"""
+    coin: Optional[str] = None
+    network: Optional[str] = None
+    depositEnable: Optional[bool] = None
+    withdrawEnable: Optional[bool] = None
+    contract: Optional[str] = None
+    contractAddress: Optional[str] = None
+
+
+class Coin(msgspec.Struct):
+    """
+    A coin from /capital/config/getall.
+    Only the fields the bot reads are declared; everything else in the payload
+    is skipped by the decoder instead of being materialized as dicts.
+    """
+    coin: str
+    # MEXC sends the full coin name under a capitalized key
+    name: Optional[str] = msgspec.field(default=None, name="Name")
+    depositAllEnable: Optional[bool] = None
+    withdrawAllEnable: Optional[bool] = None
+    networkList: List[CoinNetwork] = []
+
+
+COINS_DECODER = msgspec.json.Decoder(List[Coin])
@@ -4,6 +4,8 @@ from aiogram.types import Message, ChatMemberUpdated, CallbackQuery, InlineKeybo
 from aiogram.enums.chat_member_status import ChatMemberStatus
 from aiogram.utils.keyboard import InlineKeyboardBuilder
 from services.exchange_service import ExchangeService
+from services.price_streams import PriceStreamHub
+from config.config_manager import ConfigManager
 import logging
 from typing import Dict, Optional, Any, List, Set
 import asyncio
@@ -14,17 +16,30 @@ import re
 import json
 import aiohttp
 import time
-import uuid  # Add import for UUID generation
 
 # Import the monitor service for shared state
-from services.monitor_service import MonitorService
+from services.monitor_service import DEFAULT_MODE_TEXT, MODE_TEXT, MonitorService
 
 # Create a shared monitor service instance
 _monitor_service = MonitorService()
 
 # Global constants
 PRICE_CHECK_INTERVAL = 60  # seconds
+ALERT_GROUP_ID = ConfigManager.get_alert_group_id()
+TOPIC_ID = int(os.getenv("TOPIC_ID", "1"))  # Forum topic for alerts in the alert group
+DEXTOOLS_API_KEY = os.getenv("DEXTOOLS_API_KEY")
 MIN_ARBITRAGE_PERCENTAGE = 0.1  # 0.1%
+STREAMING_EXCHANGES = ("bitget", "gate")  # Exchanges with WebSocket ticker feeds
+STREAMED_PRICE_MAX_AGE = 30  # seconds before falling back to REST
+TELEGRAM_MESSAGE_LIMIT = 4096  # characters per Bot API message
+ALERT_SEPARATOR = "\n\n"
+MAX_CONCURRENT_PRICE_SCANS = 5  # monitors allowed to poll exchanges at the same time
+
+# Plain decimal percentage such as "0.5", "2" or ".75", surrounding whitespace allowed
+_PCT_RE = re.compile(r"^\s*(\d+(?:\.\d+)?|\.\d+)\s*$")
+
+# Shared by every monitor so N monitors don't fire N x exchanges requests at once
+price_scan_semaphore = asyncio.Semaphore(MAX_CONCURRENT_PRICE_SCANS)
 
 # For backward compatibility, expose the service's variables
 active_monitors = _monitor_service.active_monitors  
@@ -55,27 +70,25 @@ def format_price(price: float) -> str:
 # Function to generate a unique ID for each query
 def generate_query_id() -> str:
     """Generate a unique ID for a monitoring query"""
-    return str(uuid.uuid4())
+    return _monitor_service.new_query_id()
 
-# Create a router instance
+# Create a router instance. bot.py does not include this router: the live
+# commands are in commands/monitor_commands and commands/basic_commands, and
+# only the monitoring code and shared state in this module are used at runtime
 router = Router()
 exchange_service = ExchangeService()
+# WebSocket ticker feeds shared by all monitors
+price_streams = PriceStreamHub(exchange_service._get_exchange_client, STREAMING_EXCHANGES, STREAMED_PRICE_MAX_AGE)
 logger = logging.getLogger(__name__)
 
-# Store admin IDs
-ADMIN_IDS_ENV = os.getenv("ADMIN_USER_IDS", "741239404,180247888")
-ADMIN_IDS: Set[int] = {int(id.strip()) for id in ADMIN_IDS_ENV.split(",")}
-
 def is_admin(user_id: int) -> bool:
-    """Check if user is an admin"""
-    logger.info(f"Checking if user {user_id} is admin. Admin IDs: {ADMIN_IDS}")
-    return user_id in ADMIN_IDS
+    """Check if user is an admin, against the frozenset cached by ConfigManager"""
+    return user_id in ConfigManager.get_admin_user_ids()
 
 @router.my_chat_member()
 async def on_bot_status_changed(event: ChatMemberUpdated):
     """Handle when bot's status changes in a chat"""
     chat_id = event.chat.id
-    topic_id = int(os.getenv("TOPIC_ID", "1"))  # Get topic ID from env
     
     # Bot was added as admin
     if (event.old_chat_member.status in [ChatMemberStatus.LEFT, ChatMemberStatus.MEMBER] and 
@@ -86,10 +99,7 @@ async def on_bot_status_changed(event: ChatMemberUpdated):
     # Bot was removed as admin
     elif (event.old_chat_member.status == ChatMemberStatus.ADMINISTRATOR and 
           event.new_chat_member.status != ChatMemberStatus.ADMINISTRATOR):
-        if chat_id in active_monitors:
-            for query_id, task in active_monitors[chat_id].items():
-                task.cancel()
-            del active_monitors[chat_id]
+        await _monitor_service.cancel_tasks(active_monitors.pop(chat_id, {}).values())
 
 @router.message(Command("start"))
 async def cmd_start(message: Message):
@@ -126,7 +136,7 @@ async def cmd_start(message: Message):
 async def cmd_chat_info(message: Message):
     """Handler to get detailed chat information"""
     # Get topic ID from config but allow message thread ID to override it
-    config_topic_id = int(os.getenv("TOPIC_ID", "1"))
+    config_topic_id = TOPIC_ID
     actual_topic_id = message.message_thread_id if message.message_thread_id else config_topic_id
 
     chat_info = (
@@ -140,7 +150,7 @@ async def cmd_chat_info(message: Message):
         f"Using Topic ID: {actual_topic_id}"
     )
     
-    logger.info(f"Chat Info Request:\n{chat_info}")
+    logger.info("Chat Info Request:\n%s", chat_info)
     
     try:
         # Always use the topic ID from config for supergroups
@@ -174,6 +184,9 @@ async def cmd_chat_info(message: Message):
 
 async def calculate_arbitrage(prices: Dict[str, Dict[str, Optional[float]]], min_arbitrage_percentage: float = MIN_ARBITRAGE_PERCENTAGE, filter_mode: str = "all") -> List[Dict]:
     """Calculate all possible arbitrage opportunities between exchanges and DEX"""
+    # The per-pair debug lines format prices eagerly, so only build them when they will be emitted
+    log_debug = logger.isEnabledFor(logging.DEBUG)
+    
     # Helper functions to improve readability and reduce duplication
     def calc_percentage(buy_price: float, sell_price: float) -> float:
         """Calculate percentage difference between prices"""
@@ -198,7 +211,7 @@ async def calculate_arbitrage(prices: Dict[str, Dict[str, Optional[float]]], min
                 opp_type == "cex_to_dex_futures"
             )
             
-        logger.warning(f"Unknown filter mode: {filter_mode}")
+        logger.warning("Unknown filter mode: %s", filter_mode)
         return True  # Default to including all opportunities
     
     def create_opportunity(opp_type: str, source: str, target: str, source_price: float, 
@@ -218,9 +231,9 @@ async def calculate_arbitrage(prices: Dict[str, Dict[str, Optional[float]]], min
         if direction == "dex_to_cex_spot":
             percentage = calc_percentage(dex_price, cex_price)
             if percentage >= min_arbitrage_percentage:
-                logger.info(f"Found DEX->CEX Spot opportunity with {percentage:.2f}%")
+                logger.info("Found DEX->CEX Spot opportunity with %.2f%%", percentage)
                 if not should_include_opportunity_type("dex_to_cex_spot", filter_mode):
-                    logger.info(f"Skipping DEX->CEX Spot opportunity due to filter mode {filter_mode}")
+                    logger.info("Skipping DEX->CEX Spot opportunity due to filter mode %s", filter_mode)
                     return None
                 return create_opportunity('dex_to_cex_spot', dex, cex, dex_price, cex_price, percentage,
                                          dex=dex, cex=cex, dex_price=dex_price, cex_price=cex_price)
@@ -228,9 +241,9 @@ async def calculate_arbitrage(prices: Dict[str, Dict[str, Optional[float]]], min
         elif direction == "cex_to_dex_spot":
             percentage = calc_percentage(cex_price, dex_price)
             if percentage >= min_arbitrage_percentage:
-                logger.info(f"Found CEX->DEX Spot opportunity with {percentage:.2f}%")
+                logger.info("Found CEX->DEX Spot opportunity with %.2f%%", percentage)
                 if not should_include_opportunity_type("cex_to_dex_spot", filter_mode):
-                    logger.info(f"Skipping CEX->DEX Spot opportunity due to filter mode {filter_mode}")
+                    logger.info("Skipping CEX->DEX Spot opportunity due to filter mode %s", filter_mode)
                     return None
                 return create_opportunity('cex_to_dex_spot', cex, dex, cex_price, dex_price, percentage,
                                          dex=dex, cex=cex, dex_price=dex_price, cex_price=cex_price)
@@ -238,9 +251,9 @@ async def calculate_arbitrage(prices: Dict[str, Dict[str, Optional[float]]], min
         elif direction == "dex_to_cex_futures":
             percentage = calc_percentage(dex_price, cex_price)
             if percentage >= min_arbitrage_percentage:
-                logger.info(f"Found DEX->CEX Futures opportunity with {percentage:.2f}%")
+                logger.info("Found DEX->CEX Futures opportunity with %.2f%%", percentage)
                 if not should_include_opportunity_type("dex_to_cex_futures", filter_mode):
-                    logger.info(f"Skipping DEX->CEX Futures opportunity due to filter mode {filter_mode}")
+                    logger.info("Skipping DEX->CEX Futures opportunity due to filter mode %s", filter_mode)
                     return None
                 return create_opportunity('dex_to_cex_futures', dex, cex, dex_price, cex_price, percentage,
                                          dex=dex, cex=cex, dex_price=dex_price, cex_price=cex_price)
@@ -248,9 +261,9 @@ async def calculate_arbitrage(prices: Dict[str, Dict[str, Optional[float]]], min
         elif direction == "cex_to_dex_futures":
             percentage = calc_percentage(cex_price, dex_price) 
             if percentage >= min_arbitrage_percentage:
-                logger.info(f"Found CEX->DEX Futures opportunity with {percentage:.2f}%")
+                logger.info("Found CEX->DEX Futures opportunity with %.2f%%", percentage)
                 if not should_include_opportunity_type("cex_to_dex_futures", filter_mode):
-                    logger.info(f"Skipping CEX->DEX Futures opportunity due to filter mode {filter_mode}")
+                    logger.info("Skipping CEX->DEX Futures opportunity due to filter mode %s", filter_mode)
                     return None
                 return create_opportunity('cex_to_dex_futures', cex, dex, cex_price, dex_price, percentage,
                                          dex=dex, cex=cex, dex_price=dex_price, cex_price=cex_price)
@@ -263,22 +276,24 @@ async def calculate_arbitrage(prices: Dict[str, Dict[str, Optional[float]]], min
         
         # Check ex1 -> ex2 direction
         percentage1 = calc_percentage(price1, price2)
-        logger.debug(f"CEX {market_type} {ex1}->{ex2}: {format_price(price1)}->{format_price(price2)} = {percentage1:.2f}%")
+        if log_debug:
+            logger.debug("CEX %s %s->%s: %s->%s = %.2f%%", market_type, ex1, ex2, format_price(price1), format_price(price2), percentage1)
         
         # Check ex2 -> ex1 direction
         percentage2 = calc_percentage(price2, price1)
-        logger.debug(f"CEX {market_type} {ex2}->{ex1}: {format_price(price2)}->{format_price(price1)} = {percentage2:.2f}%")
+        if log_debug:
+            logger.debug("CEX %s %s->%s: %s->%s = %.2f%%", market_type, ex2, ex1, format_price(price2), format_price(price1), percentage2)
         
         opp_type = f"cross_exchange_{market_type.lower()}"
         if percentage1 >= min_arbitrage_percentage and should_include_opportunity_type(opp_type, filter_mode):
-            logger.info(f"Found CEX->CEX {market_type} opportunity: {ex1}->{ex2} with {percentage1:.2f}%")
+            logger.info("Found CEX->CEX %s opportunity: %s->%s with %.2f%%", market_type, ex1, ex2, percentage1)
             results.append(create_opportunity(
                 opp_type, ex1, ex2, price1, price2, percentage1,
                 exchange1=ex1, exchange2=ex2, price1=price1, price2=price2
             ))
             
         if percentage2 >= min_arbitrage_percentage and should_include_opportunity_type(opp_type, filter_mode):
-            logger.info(f"Found CEX->CEX {market_type} opportunity: {ex2}->{ex1} with {percentage2:.2f}%")
+            logger.info("Found CEX->CEX %s opportunity: %s->%s with %.2f%%", market_type, ex2, ex1, percentage2)
             results.append(create_opportunity(
                 opp_type, ex2, ex1, price2, price1, percentage2,
                 exchange1=ex2, exchange2=ex1, price1=price2, price2=price1
@@ -289,10 +304,11 @@ async def calculate_arbitrage(prices: Dict[str, Dict[str, Optional[float]]], min
     def create_spot_futures_opportunity(ex1: str, ex2: str, spot_price: float, futures_price: float) -> Optional[Dict]:
         """Process spot to futures arbitrage opportunity"""
         percentage = calc_percentage(spot_price, futures_price)
-        logger.debug(f"CEX Spot->Futures {ex1}->{ex2}: {format_price(spot_price)}->{format_price(futures_price)} = {percentage:.2f}%")
+        if log_debug:
+            logger.debug("CEX Spot->Futures %s->%s: %s->%s = %.2f%%", ex1, ex2, format_price(spot_price), format_price(futures_price), percentage)
         
         if percentage >= min_arbitrage_percentage and should_include_opportunity_type("cross_exchange_spot_futures", filter_mode):
-            logger.info(f"Found CEX Spot->Futures opportunity: {ex1}->{ex2} with {percentage:.2f}%")
+            logger.info("Found CEX Spot->Futures opportunity: %s->%s with %.2f%%", ex1, ex2, percentage)
             return create_opportunity(
                 'cross_exchange_spot_futures', ex1, ex2, spot_price, futures_price, percentage,
                 spot_exchange=ex1, futures_exchange=ex2, spot_price=spot_price, futures_price=futures_price
@@ -302,10 +318,11 @@ async def calculate_arbitrage(prices: Dict[str, Dict[str, Optional[float]]], min
     def create_futures_spot_opportunity(ex1: str, ex2: str, futures_price: float, spot_price: float) -> Optional[Dict]:
         """Process futures to spot arbitrage opportunity"""
         percentage = calc_percentage(futures_price, spot_price)
-        logger.debug(f"CEX Futures->Spot {ex1}->{ex2}: {format_price(futures_price)}->{format_price(spot_price)} = {percentage:.2f}%")
+        if log_debug:
+            logger.debug("CEX Futures->Spot %s->%s: %s->%s = %.2f%%", ex1, ex2, format_price(futures_price), format_price(spot_price), percentage)
         
         if percentage >= min_arbitrage_percentage and should_include_opportunity_type("cross_exchange_futures_spot", filter_mode):
-            logger.info(f"Found CEX Futures->Spot opportunity: {ex1}->{ex2} with {percentage:.2f}%")
+            logger.info("Found CEX Futures->Spot opportunity: %s->%s with %.2f%%", ex1, ex2, percentage)
             return create_opportunity(
                 'cross_exchange_futures_spot', ex1, ex2, futures_price, spot_price, percentage,
                 futures_exchange=ex1, spot_exchange=ex2, futures_price=futures_price, spot_price=spot_price
@@ -315,10 +332,11 @@ async def calculate_arbitrage(prices: Dict[str, Dict[str, Optional[float]]], min
     def create_same_exchange_opportunity(ex: str, spot_price: float, futures_price: float) -> Optional[Dict]:
         """Process same-exchange spot to futures arbitrage opportunity"""
         percentage = calc_percentage(spot_price, futures_price)
-        logger.debug(f"Same CEX Spot->Futures {ex}: {format_price(spot_price)}->{format_price(futures_price)} = {percentage:.2f}%")
+        if log_debug:
+            logger.debug("Same CEX Spot->Futures %s: %s->%s = %.2f%%", ex, format_price(spot_price), format_price(futures_price), percentage)
         
         if percentage >= min_arbitrage_percentage and should_include_opportunity_type("same_exchange_spot_futures", filter_mode):
-            logger.info(f"Found same-exchange Spot->Futures opportunity on {ex} with {percentage:.2f}%")
+            logger.info("Found same-exchange Spot->Futures opportunity on %s with %.2f%%", ex, percentage)
             return create_opportunity(
                 'same_exchange_spot_futures', ex, ex, spot_price, futures_price, percentage,
                 exchange=ex, spot_price=spot_price, futures_price=futures_price
@@ -330,19 +348,19 @@ async def calculate_arbitrage(prices: Dict[str, Dict[str, Optional[float]]], min
     exchanges = [ex for ex in prices.keys() if not prices[ex].get('is_dex', False)]
     dex_chains = [ex for ex in prices.keys() if prices[ex].get('is_dex', False)]
     
-    logger.info(f"Found DEX chains: {dex_chains}")
-    logger.info(f"Found CEX exchanges: {exchanges}")
-    logger.info(f"Filter mode: {filter_mode}")
+    logger.info("Found DEX chains: %s", dex_chains)
+    logger.info("Found CEX exchanges: %s", exchanges)
+    logger.info("Filter mode: %s", filter_mode)
     
     # Process DEX to CEX opportunities
     if should_include_opportunity_type("dex_to_cex_spot", filter_mode) or should_include_opportunity_type("dex_to_cex_futures", filter_mode):
         for dex in dex_chains:
             dex_price = prices[dex]['spot']  # DEX only has spot price
             if not dex_price:
-                logger.warning(f"No price found for DEX {dex}")
+                logger.warning("No price found for DEX %s", dex)
                 continue
                 
-            logger.info(f"Processing DEX {dex} with price ${format_price(dex_price)}")
+            logger.info("Processing DEX %s with price $%s", dex, format_price(dex_price))
             
             for ex in exchanges:
                 # DEX to CEX Spot
@@ -487,21 +505,21 @@ async def monitor_prices(chat_id: int, query: str, bot, min_arbitrage_percentage
             for chat_queries in user_queries.values():
                 if query_id in chat_queries:
                     filter_mode = chat_queries[query_id].get('filter_mode', "all")
-                    logger.info(f"Found filter mode {filter_mode} in user_queries for ID {query_id}")
+                    logger.info("Found filter mode %s in user_queries for ID %s", filter_mode, query_id)
                     break
         
         # If still None, fallback to user_filter_preferences or "all"
         if filter_mode is None:
             filter_mode = user_filter_preferences.get(chat_id, "all")  # Default to showing all
             
-        logger.info(f"Starting monitoring for {query} (ID: {query_id}) with filter mode: {filter_mode}")
+        logger.info("Starting monitoring for %s (ID: %s) with filter mode: %s", query, query_id, filter_mode)
         
         # Validate the filter mode
         if filter_mode not in ["cex_only", "cex_dex_only", "future", "all"]:
-            logger.warning(f"Invalid filter mode: {filter_mode}. Defaulting to 'all'")
+            logger.warning("Invalid filter mode: %s. Defaulting to 'all'", filter_mode)
             filter_mode = "all"
             
-        logger.info(f"Using validated filter mode: {filter_mode} for {query} (ID: {query_id})")
+        logger.info("Using validated filter mode: %s for %s (ID: %s)", filter_mode, query, query_id)
         
         # Initialize the price monitor
         monitor = ArbitragePriceMonitor(
@@ -520,12 +538,10 @@ async def monitor_prices(chat_id: int, query: str, bot, min_arbitrage_percentage
         
         await monitor.start_monitoring()
     except asyncio.CancelledError:
-        logger.info(f"Monitoring stopped for {query} (ID: {query_id})")
+        logger.info("Monitoring stopped for %s (ID: %s)", query, query_id)
     except Exception as e:
         logger.error(f"Error in price monitoring: {str(e)}")
-        alert_group_id = int(os.getenv("ALERT_GROUP_ID"))
-        topic_id = int(os.getenv("TOPIC_ID", "1"))
-        await bot.send_message(alert_group_id, f"❌ Error in price monitoring for {query} (ID: {query_id}): {str(e)}", message_thread_id=topic_id, parse_mode="HTML", disable_web_page_preview=True)
+        await bot.send_message(ALERT_GROUP_ID, f"❌ Error in price monitoring for {query} (ID: {query_id}): {str(e)}", message_thread_id=TOPIC_ID, parse_mode="HTML", disable_web_page_preview=True)
 
 class ArbitragePriceMonitor:
     """Class to monitor prices and detect arbitrage opportunities"""
@@ -538,19 +554,19 @@ class ArbitragePriceMonitor:
         self.query_id = query_id or generate_query_id()  # Use provided ID or generate a new one
         # Make sure filter_mode is either "cex_only", "cex_dex_only", "future" or "all"
         if filter_mode not in ["cex_only", "cex_dex_only", "future", "all"]:
-            logger.warning(f"Invalid filter_mode provided: {filter_mode}, defaulting to 'all'")
+            logger.warning("Invalid filter_mode provided: %s, defaulting to 'all'", filter_mode)
             filter_mode = "all"
         self.filter_mode = filter_mode  # "all", "cex_only", "cex_dex_only", or "future"
         self.network = network  # Network for DEX operations (e.g., 'Ethereum', 'BSC')
         self.pool_address = pool_address  # Pool address for DEX operations
         # Flag to control deposit/withdrawal feasibility checks
         self.enforce_deposit_withdrawal_checks = enforce_deposit_withdrawal_checks
-        logger.info(f"ArbitragePriceMonitor initialized with filter_mode: {self.filter_mode}")
+        logger.info("ArbitragePriceMonitor initialized with filter_mode: %s", self.filter_mode)
         if self.network and self.pool_address:
-            logger.info(f"DEX parameters provided - Network: {self.network}, Pool Address: {self.pool_address}")
+            logger.info("DEX parameters provided - Network: %s, Pool Address: %s", self.network, self.pool_address)
         self.last_opportunities = set()
-        self.alert_group_id = int(os.getenv("ALERT_GROUP_ID"))
-        self.topic_id = int(os.getenv("TOPIC_ID", "1"))
+        self.alert_group_id = ALERT_GROUP_ID
+        self.topic_id = TOPIC_ID
         self.cex_exchanges = ["bitget", "gate", "mexc", "bybit", "bingx", "binance"]
         self.chain_mapping = {
             'BASEEVM': 'BASEEVM',
@@ -564,15 +580,25 @@ class ArbitragePriceMonitor:
     
     async def start_monitoring(self):
         """Start the monitoring loop"""
+        await price_streams.subscribe(self.query)
+        try:
+            await self._monitoring_loop()
+        finally:
+            await price_streams.unsubscribe(self.query)
+
+    async def _monitoring_loop(self):
+        """Fetch prices and process opportunities every tick"""
         while True:
             prices = {}
             has_any_price = False
             
-            # Collect prices from DEX and CEX
-            dex_prices = await self._fetch_dex_prices()
+            # Collect prices from DEX and CEX concurrently
+            async with price_scan_semaphore:
+                dex_prices, cex_prices = await asyncio.gather(
+                    self._fetch_dex_prices(),
+                    self._fetch_cex_prices()
+                )
             prices.update(dex_prices)
-            
-            cex_prices = await self._fetch_cex_prices()
             prices.update(cex_prices)
             
             # Determine if we have any prices
@@ -596,15 +622,15 @@ class ArbitragePriceMonitor:
         """Fetch prices from DEX platforms"""
         dex_prices = {}
         try:
-            logger.info(f"Starting DEX price check for {self.query}")
+            logger.info("Starting DEX price check for %s", self.query)
             
             # If pool address and network are explicitly provided, use them directly
             if self.network and self.pool_address:
-                logger.info(f"Using provided network and pool address: {self.network}, {self.pool_address}")
+                logger.info("Using provided network and pool address: %s, %s", self.network, self.pool_address)
                 
                 # Initialize DexTools API
-                dex_tools = DexTools(api_key=os.getenv("DEXTOOLS_API_KEY"))
-                logger.info(f"Initialized DexTools with API key")
+                dex_tools = DexTools(api_key=DEXTOOLS_API_KEY)
+                logger.info("Initialized DexTools with API key")
                 
                 dex_price = await self._get_pool_price(dex_tools, self.network, self.pool_address)
                 if dex_price:
@@ -617,20 +643,20 @@ class ArbitragePriceMonitor:
             
             # Otherwise, use the traditional chain lookup method (fallback for compatibility)
             chains = await exchange_service.get_currency_chains("gate", self.query)
-            logger.info(f"Retrieved chains for {self.query}: {chains}")
+            logger.info("Retrieved chains for %s: %s", self.query, chains)
             
             if not chains:
-                logger.info(f"No chains found for {self.query}")
+                logger.info("No chains found for %s", self.query)
                 return dex_prices
                 
             # Initialize DexTools API
-            dex_tools = DexTools(api_key=os.getenv("DEXTOOLS_API_KEY"))
-            logger.info(f"Initialized DexTools with API key")
+            dex_tools = DexTools(api_key=DEXTOOLS_API_KEY)
+            logger.info("Initialized DexTools with API key")
             
             # Process each chain
             for chain_name, contract_address in chains:
                 if not chain_name or not contract_address:
-                    logger.warning(f"Invalid chain data: {chain_name}, {contract_address}")
+                    logger.warning("Invalid chain data: %s, %s", chain_name, contract_address)
                     continue
                 
                 dex_price = await self._get_token_price(dex_tools, chain_name, contract_address)
@@ -651,20 +677,21 @@ class ArbitragePriceMonitor:
             # Convert chain name to DexTools format
             dextools_chain = self.chain_mapping.get(chain_name.upper())
             if not dextools_chain:
-                logger.warning(f"Unsupported chain {chain_name} for DexTools")
+                logger.warning("Unsupported chain %s for DexTools", chain_name)
                 return None
                 
-            logger.info(f"Processing chain {chain_name} ({dextools_chain}) for token {self.query}")
-            logger.debug(f"Contract address for {chain_name}: {contract_address}")
+            logger.info("Processing chain %s (%s) for token %s", chain_name, dextools_chain, self.query)
+            logger.debug("Contract address for %s: %s", chain_name, contract_address)
             
-            logger.info(f"Requesting DexTools token price for {self.query} on {dextools_chain}")
-            price = dex_tools.get_token_price(dextools_chain, contract_address)
+            logger.info("Requesting DexTools token price for %s on %s", self.query, dextools_chain)
+            # DexTools uses blocking requests; run it on a worker thread so the event loop keeps serving updates
+            price = await asyncio.to_thread(dex_tools.get_token_price, dextools_chain, contract_address)
             
             if price is not None:
-                logger.info(f"Successfully got token price for {self.query} on {dextools_chain}: ${format_price(price)}")
+                logger.info("Successfully got token price for %s on %s: $%s", self.query, dextools_chain, format_price(price))
                 return price
             else:
-                logger.warning(f"No token price returned from DexTools for {self.query} on {dextools_chain}")
+                logger.warning("No token price returned from DexTools for %s on %s", self.query, dextools_chain)
                 return None
         except Exception as e:
             logger.error(f"Error getting token price for chain {chain_name}: {str(e)}", exc_info=True)
@@ -678,55 +705,55 @@ class ArbitragePriceMonitor:
             if not dextools_chain:
                 # Try to use the chain name directly if it's not in our mapping
                 dextools_chain = chain_name.lower()
-                logger.info(f"Using chain name directly for DexTools: {dextools_chain}")
+                logger.info("Using chain name directly for DexTools: %s", dextools_chain)
                 
-            logger.info(f"Processing chain {chain_name} ({dextools_chain}) for pool for {self.query}")
-            logger.debug(f"Pool address for {chain_name}: {pool_address}")
+            logger.info("Processing chain %s (%s) for pool for %s", chain_name, dextools_chain, self.query)
+            logger.debug("Pool address for %s: %s", chain_name, pool_address)
             
-            logger.info(f"Requesting DexTools pool price for {self.query} on {dextools_chain}")
-            price = dex_tools.get_pool_price(dextools_chain, pool_address)
+            logger.info("Requesting DexTools pool price for %s on %s", self.query, dextools_chain)
+            price = await asyncio.to_thread(dex_tools.get_pool_price, dextools_chain, pool_address)
             
             if price is not None:
-                logger.info(f"Successfully got pool price for {self.query} on {dextools_chain}: ${format_price(price)}")
+                logger.info("Successfully got pool price for %s on %s: $%s", self.query, dextools_chain, format_price(price))
                 return price
             else:
-                logger.warning(f"No pool price returned from DexTools for {self.query} on {dextools_chain}")
+                logger.warning("No pool price returned from DexTools for %s on %s", self.query, dextools_chain)
                 return None
         except Exception as e:
             logger.error(f"Error getting pool price for chain {chain_name}: {str(e)}", exc_info=True)
             return None
     
     async def _fetch_cex_prices(self) -> Dict[str, Dict[str, Any]]:
-        """Fetch prices from centralized exchanges"""
-        cex_prices = {}
-        
+        """Fetch spot and futures prices from all centralized exchanges concurrently"""
+        cex_prices = {
+            exchange: {'spot': None, 'futures': None, 'is_dex': False}
+            for exchange in self.cex_exchanges
+        }
+
+        # Use fresh WebSocket prices where available and poll REST for the rest
+        lookups = []
         for exchange in self.cex_exchanges:
-            cex_prices[exchange] = {
-                'spot': None,
-                'futures': None,
-                'is_dex': False
-            }
-            
-            # Get spot price
-            try:
-                spot_price = await exchange_service.get_average_price(
-                    exchange, self.query, market_type="spot"
-                )
-                if spot_price:
-                    cex_prices[exchange]['spot'] = spot_price
-            except Exception as e:
-                logger.error(f"Error getting spot price for {exchange}: {str(e)}")
-            
-            # Get futures price
-            try:
-                futures_price = await exchange_service.get_average_price(
-                    exchange, self.query, market_type="futures"
-                )
-                if futures_price:
-                    cex_prices[exchange]['futures'] = futures_price
-            except Exception as e:
-                logger.error(f"Error getting futures price for {exchange}: {str(e)}")
-        
+            for market_type in ("spot", "futures"):
+                streamed_price = price_streams.get_price(exchange, market_type, self.query)
+                if streamed_price:
+                    cex_prices[exchange][market_type] = streamed_price
+                else:
+                    lookups.append((exchange, market_type))
+
+        results = await asyncio.gather(
+            *(
+                exchange_service.get_average_price(exchange, self.query, market_type=market_type)
+                for exchange, market_type in lookups
+            ),
+            return_exceptions=True
+        )
+
+        for (exchange, market_type), price in zip(lookups, results):
+            if isinstance(price, Exception):
+                logger.error(f"Error getting {market_type} price for {exchange}: {str(price)}")
+            elif price:
+                cex_prices[exchange][market_type] = price
+
         return cex_prices
     
     async def _format_price_message(self, prices: Dict[str, Dict[str, Any]]) -> str:
@@ -822,17 +849,17 @@ class ArbitragePriceMonitor:
         opportunities = await calculate_arbitrage(prices, self.min_arbitrage_percentage, self.filter_mode)
         
         # Log all opportunities before filtering
-        logger.info(f"Filter mode: {self.filter_mode}")
-        logger.info(f"Total opportunities before filtering: {len(opportunities)}")
+        logger.info("Filter mode: %s", self.filter_mode)
+        logger.info("Total opportunities before filtering: %s", len(opportunities))
         for opp in opportunities:
-            logger.info(f"Opportunity type: {opp['type']}, percentage: {opp['percentage']:.2f}%")
+            logger.info("Opportunity type: %s, percentage: %.2f%%", opp['type'], opp['percentage'])
         
         # Filter significant opportunities (>= MIN_ARBITRAGE_PERCENTAGE) and apply filter mode
         significant_opportunities = []
         for opp in opportunities:
             # Basic filter: opportunity must meet minimum percentage
             if opp['percentage'] < self.min_arbitrage_percentage:
-                logger.debug(f"Filtering out opportunity {opp['type']} due to percentage {opp['percentage']} < {self.min_arbitrage_percentage}")
+                logger.debug("Filtering out opportunity %s due to percentage %s < %s", opp['type'], opp['percentage'], self.min_arbitrage_percentage)
                 continue
                 
             # Filter by opportunity type based on filter mode
@@ -841,17 +868,17 @@ class ArbitragePriceMonitor:
                 if not (opp['type'] == 'cross_exchange_futures' or  # CEX Futures to CEX Futures
                         opp['type'] == 'dex_to_cex_futures' or      # DEX to CEX Futures
                         opp['type'] == 'cex_to_dex_futures'):       # CEX Futures to DEX
-                    logger.info(f"Filtering out non-futures opportunity in future mode: {opp['type']}")
+                    logger.info("Filtering out non-futures opportunity in future mode: %s", opp['type'])
                     continue
                 else:
-                    logger.info(f"Keeping futures opportunity in future mode: {opp['type']}")
+                    logger.info("Keeping futures opportunity in future mode: %s", opp['type'])
             elif self.filter_mode == "cex_only":
                 # Only include CEX-CEX opportunities
                 if not (opp['type'] == 'cross_exchange_spot' or 
                         opp['type'] == 'cross_exchange_futures' or
                         opp['type'] == 'cross_exchange_spot_futures' or
                         opp['type'] == 'cross_exchange_futures_spot'):
-                    logger.debug(f"Filtering out non-CEX-CEX opportunity in cex_only mode: {opp['type']}")
+                    logger.debug("Filtering out non-CEX-CEX opportunity in cex_only mode: %s", opp['type'])
                     continue
             elif self.filter_mode == "cex_dex_only":
                 # Only include CEX-DEX opportunities
@@ -859,23 +886,23 @@ class ArbitragePriceMonitor:
                         opp['type'] == 'cex_to_dex_spot' or
                         opp['type'] == 'dex_to_cex_futures' or
                         opp['type'] == 'cex_to_dex_futures'):
-                    logger.debug(f"Filtering out non-CEX-DEX opportunity in cex_dex_only mode: {opp['type']}")
+                    logger.debug("Filtering out non-CEX-DEX opportunity in cex_dex_only mode: %s", opp['type'])
                     continue
                 
             # NOTE: Opportunity feasibility check based on deposit/withdrawal status
             # This functionality is currently a placeholder and will be configurable in the future
             is_feasible = await self._check_opportunity_feasibility(opp)
             if not is_feasible:
-                logger.info(f"Filtering out opportunity {opp['type']} due to deposit/withdrawal constraints")
+                logger.info("Filtering out opportunity %s due to deposit/withdrawal constraints", opp['type'])
                 continue
                 
             # Add opportunity to significant list
             significant_opportunities.append(opp)
             
         # Log significant opportunities after filtering
-        logger.info(f"Significant opportunities after filtering: {len(significant_opportunities)}")
+        logger.info("Significant opportunities after filtering: %s", len(significant_opportunities))
         for opp in significant_opportunities:
-            logger.info(f"Significant opportunity type: {opp['type']}, percentage: {opp['percentage']:.2f}%")
+            logger.info("Significant opportunity type: %s, percentage: %.2f%%", opp['type'], opp['percentage'])
         
         # Generate unique IDs for each opportunity
         current_opps = self._generate_opportunity_ids(significant_opportunities)
@@ -901,14 +928,14 @@ class ArbitragePriceMonitor:
                 opp_id = self._get_opportunity_id(opp)
                 if opp_id:
                     current_opps.add(opp_id)
-                    logger.debug(f"Added opportunity ID: {opp_id}")
+                    logger.debug("Added opportunity ID: %s", opp_id)
                 
             except KeyError as ke:
                 logger.error(f"Missing key in opportunity dict: {ke}", exc_info=True)
-                logger.debug(f"Opportunity data: {opp}")
+                logger.debug("Opportunity data: %s", opp)
             except Exception as e:
                 logger.error(f"Error processing opportunity: {str(e)}", exc_info=True)
-                logger.debug(f"Opportunity data: {opp}")
+                logger.debug("Opportunity data: %s", opp)
                 
         return current_opps
     
@@ -932,7 +959,7 @@ class ArbitragePriceMonitor:
             elif opp['type'] == 'cross_exchange_spot_futures':
                 opp_id += f"_{opp['spot_exchange']}_{opp['futures_exchange']}"
             else:
-                logger.warning(f"Unknown opportunity type: {opp['type']}")
+                logger.warning("Unknown opportunity type: %s", opp['type'])
                 return ""
         except KeyError as ke:
             logger.error(f"Missing key in opportunity dict: {ke}", exc_info=True)
@@ -941,14 +968,15 @@ class ArbitragePriceMonitor:
         return opp_id
     
     async def _send_new_opportunity_alerts(self, opportunities: List[Dict], new_opps: Set[str]):
-        """Send alerts for new arbitrage opportunities"""
+        """Send alerts for new arbitrage opportunities, grouped into as few messages as possible"""
         timestamp = datetime.now().strftime("%H:%M:%S")
+        alerts = []
         
         for opp in opportunities:
             try:
                 # Double-check opportunity type is valid for the current filter mode
                 if self.filter_mode == "future" and opp['type'] not in ['cross_exchange_futures', 'dex_to_cex_futures', 'cex_to_dex_futures']:
-                    logger.warning(f"Skipping invalid opportunity type for futures mode: {opp['type']}")
+                    logger.warning("Skipping invalid opportunity type for futures mode: %s", opp['type'])
                     continue
                 
                 # Generate the opportunity ID in the same way as in _generate_opportunity_ids
@@ -958,18 +986,40 @@ class ArbitragePriceMonitor:
                 if opp_id in new_opps:
                     alert_msg = await self._format_opportunity_alert(opp, timestamp)
                     if alert_msg:
-                        await self._send_message(alert_msg)
+                        alerts.append(alert_msg)
                         
             except Exception as e:
                 logger.error(f"Error processing opportunity alert: {str(e)}", exc_info=True)
-                logger.debug(f"Opportunity data: {opp}")
+                logger.debug("Opportunity data: %s", opp)
+
+        for batch in self._batch_alerts(alerts):
+            await self._send_message(batch)
+
+    @staticmethod
+    def _batch_alerts(alerts: List[str]) -> List[str]:
+        """
+        Join alerts into messages that fit Telegram's length limit.
+        Alerts are never split, so each one's HTML stays well-formed.
+        """
+        batches = []
+        current = ""
+        for alert in alerts:
+            candidate = f"{current}{ALERT_SEPARATOR}{alert}" if current else alert
+            if current and len(candidate) > TELEGRAM_MESSAGE_LIMIT:
+                batches.append(current)
+                current = alert
+            else:
+                current = candidate
+        if current:
+            batches.append(current)
+        return batches
     
     async def _format_opportunity_alert(self, opp: Dict, timestamp: str) -> Optional[str]:
         """Format an alert message for a new arbitrage opportunity"""
         try:
             # Skip same-exchange opportunities
             if opp['type'] == 'same_exchange_spot_futures':
-                logger.info(f"Skipping same-exchange opportunity for {opp['exchange']}")
+                logger.info("Skipping same-exchange opportunity for %s", opp['exchange'])
                 return None
                 
             # STRICT filter enforcement for futures mode
@@ -978,15 +1028,15 @@ class ArbitragePriceMonitor:
                 allowed_types = ['cross_exchange_futures', 'dex_to_cex_futures', 'cex_to_dex_futures']
                 
                 if opp['type'] not in allowed_types:
-                    logger.warning(f"STRICT FILTER: Rejecting non-futures opportunity in futures mode: {opp['type']}")
+                    logger.warning("STRICT FILTER: Rejecting non-futures opportunity in futures mode: %s", opp['type'])
                     return None
                 
                 # Double check for spot-related keywords in the opportunity type
                 if 'spot' in opp['type']:
-                    logger.warning(f"STRICT FILTER: Rejecting opportunity with 'spot' in type: {opp['type']}")
+                    logger.warning("STRICT FILTER: Rejecting opportunity with 'spot' in type: %s", opp['type'])
                     return None
                 
-                logger.info(f"FUTURES MODE: Allowing opportunity type: {opp['type']}")
+                logger.info("FUTURES MODE: Allowing opportunity type: %s", opp['type'])
                 
             # Create the base alert message
             token_symbol = self.query.upper()
@@ -1020,13 +1070,13 @@ class ArbitragePriceMonitor:
                     
                     return alert_msg
             else:
-                logger.warning(f"Invalid or incomplete opportunity data: {opp}")
+                logger.warning("Invalid or incomplete opportunity data: %s", opp)
                 
             return None
                 
         except Exception as e:
             logger.error(f"Error formatting alert message: {str(e)}", exc_info=True)
-            logger.debug(f"Opportunity data: {opp}")
+            logger.debug("Opportunity data: %s", opp)
             return None
             
     async def _get_deposit_withdrawal_status(self, opp: Dict) -> Optional[str]:
@@ -1325,7 +1375,7 @@ class ArbitragePriceMonitor:
                 opp['type'] == 'dex_to_cex_futures' or 
                 opp['type'] == 'cex_to_dex_futures' or
                 'futures' in opp['type']):
-                logger.debug(f"Futures-related opportunity {opp['type']} is considered feasible regardless of deposit/withdrawal status")
+                logger.debug("Futures-related opportunity %s is considered feasible regardless of deposit/withdrawal status", opp['type'])
                 return True
                 
             # For spot opportunities, check deposit/withdrawal status
@@ -1336,8 +1386,8 @@ class ArbitragePriceMonitor:
                 
                 # Log what we would check in the future
                 logger.debug(
-                    f"Checking: {source_exchange} withdrawals open AND "
-                    f"{target_exchange} deposits open for opportunity {opp['type']}"
+                    "Checking: %s withdrawals open AND %s deposits open for opportunity %s",
+                    source_exchange, target_exchange, opp['type']
                 )
                 
                 # Check arbitrage path feasibility
@@ -1348,7 +1398,7 @@ class ArbitragePriceMonitor:
             elif opp['type'] == 'dex_to_cex_spot':
                 # Only need to check if target CEX has deposits open
                 target_exchange = opp['cex']
-                logger.debug(f"Checking: {target_exchange} deposits open for opportunity {opp['type']}")
+                logger.debug("Checking: %s deposits open for opportunity %s", target_exchange, opp['type'])
                 
                 # Check if deposits are open
                 if self.enforce_deposit_withdrawal_checks:
@@ -1358,7 +1408,7 @@ class ArbitragePriceMonitor:
             elif opp['type'] == 'cex_to_dex_spot':
                 # Only need to check if source CEX has withdrawals open
                 source_exchange = opp['cex']
-                logger.debug(f"Checking: {source_exchange} withdrawals open for opportunity {opp['type']}")
+                logger.debug("Checking: %s withdrawals open for opportunity %s", source_exchange, opp['type'])
                 
                 # Check if withdrawals are open
                 if self.enforce_deposit_withdrawal_checks:
@@ -1400,8 +1450,8 @@ class ArbitragePriceMonitor:
             path_feasible = source_withdrawal_open and target_deposit_open
             
             logger.info(
-                f"Arbitrage path feasibility: {source_exchange} -> {target_exchange} = {path_feasible} "
-                f"(Withdrawals: {source_withdrawal_open}, Deposits: {target_deposit_open})"
+                "Arbitrage path feasibility: %s -> %s = %s (Withdrawals: %s, Deposits: %s)",
+                source_exchange, target_exchange, path_feasible, source_withdrawal_open, target_deposit_open
             )
             
             # If checks are enforced, return the actual feasibility
@@ -1435,7 +1485,7 @@ class ArbitragePriceMonitor:
             # Check withdrawal status
             withdrawal_open = availability.get('withdrawal', False)
             
-            logger.debug(f"Withdrawal status for {self.query} on {exchange}: {withdrawal_open}")
+            logger.debug("Withdrawal status for %s on %s: %s", self.query, exchange, withdrawal_open)
             
             return withdrawal_open
             
@@ -1463,7 +1513,7 @@ class ArbitragePriceMonitor:
             # Check deposit status
             deposit_open = availability.get('deposit', False)
             
-            logger.debug(f"Deposit status for {self.query} on {exchange}: {deposit_open}")
+            logger.debug("Deposit status for %s on %s: %s", self.query, exchange, deposit_open)
             
             return deposit_open
             
@@ -1476,8 +1526,6 @@ async def cmd_stop(message: Message):
     """Stop monitoring for the chat"""
     user_id = message.from_user.id
     chat_id = message.chat.id
-    alert_group_id = int(os.getenv("ALERT_GROUP_ID"))
-    topic_id = int(os.getenv("TOPIC_ID", "0"))  # Get topic ID from env
     bot = message.bot
     
     # Check if user is admin and message is in private chat
@@ -1488,71 +1536,70 @@ async def cmd_stop(message: Message):
         return
     
     # Parse arguments: /stop [monitor_id]
-    args = message.text.split()
+    args = message.text.split(maxsplit=2)
     monitor_id = args[1] if len(args) > 1 else None
     
-    if chat_id not in active_monitors or not active_monitors[chat_id]:
+    monitors = active_monitors.get(chat_id)
+    if not monitors:
         await message.answer("❌ No active monitors to stop")
         return
         
     if monitor_id:
-        # Stop specific monitor
-        found = False
-        for query_id, task in list(active_monitors[chat_id].items()):
-            if query_id.startswith(monitor_id):
-                task.cancel()
-                del active_monitors[chat_id][query_id]
-                found = True
-                # Send confirmation to both alert group and admin
-                await bot.send_message(
-                    alert_group_id, 
+        # Stop specific monitor, looked up by its short ID
+        found = _monitor_service.find_monitor(monitor_id, chat_id)
+        if found is None:
+            await message.answer(f"❌ No monitor found with ID: {monitor_id}")
+        else:
+            _, query_id, task = found
+            monitors.pop(query_id, None)
+            await _monitor_service.cancel_tasks([task])
+            # Send confirmation to both alert group and admin at once
+            await asyncio.gather(
+                bot.send_message(
+                    ALERT_GROUP_ID, 
                     f"✅ Monitoring stopped for ID: {query_id[:8]}", 
-                    message_thread_id=topic_id, 
+                    message_thread_id=TOPIC_ID, 
                     parse_mode="HTML", 
                     disable_web_page_preview=True
-                )
-                await message.answer(f"✅ Stopped monitoring for ID: {query_id[:8]}")
-                break
-        
-        if not found:
-            await message.answer(f"❌ No monitor found with ID: {monitor_id}")
+                ),
+                message.answer(f"✅ Stopped monitoring for ID: {query_id[:8]}")
+            )
             
         # If no more monitors, clean up the dict
-        if not active_monitors[chat_id]:
-            del active_monitors[chat_id]
+        if not active_monitors.get(chat_id):
+            active_monitors.pop(chat_id, None)
     else:
         # Stop all monitors
-        for query_id, task in list(active_monitors[chat_id].items()):
-            task.cancel()
-        
-        num_stopped = len(active_monitors[chat_id])
-        del active_monitors[chat_id]
-        
-        # Send confirmation to both alert group and admin
-        await bot.send_message(
-            alert_group_id, 
-            f"✅ All monitoring stopped ({num_stopped} monitors)", 
-            message_thread_id=topic_id, 
-            parse_mode="HTML", 
-            disable_web_page_preview=True
+        stopped = active_monitors.pop(chat_id, {})
+        await _monitor_service.cancel_tasks(stopped.values())
+        
+        num_stopped = len(stopped)
+        
+        # Send confirmation to both alert group and admin at once
+        await asyncio.gather(
+            bot.send_message(
+                ALERT_GROUP_ID, 
+                f"✅ All monitoring stopped ({num_stopped} monitors)", 
+                message_thread_id=TOPIC_ID, 
+                parse_mode="HTML", 
+                disable_web_page_preview=True
+            ),
+            message.answer(f"✅ All monitoring stopped ({num_stopped} monitors)")
         )
-        await message.answer(f"✅ All monitoring stopped ({num_stopped} monitors)")
 
-@router.message()
+@router.message(F.text)
 async def handle_search(message: Message):
     user_id = message.from_user.id
     chat_id = message.chat.id
-    alert_group_id = int(os.getenv("ALERT_GROUP_ID"))
-    topic_id = int(os.getenv("TOPIC_ID", "1"))
     bot = message.bot
     
-    logger.info(f"Received message from user ID: {user_id}, chat type: {message.chat.type}")
+    logger.info("Received message from user ID: %s, chat type: %s", user_id, message.chat.type)
     
     # Check if user is admin and message is in private chat
     if not is_admin(user_id) or message.chat.type != "private":
         # Only respond in private chats
         if message.chat.type == "private":
-            logger.info(f"User {user_id} is not an admin, rejecting command")
+            logger.info("User %s is not an admin, rejecting command", user_id)
             await message.answer("❌ Only admins can specify coins to monitor")
         return
     
@@ -1565,10 +1612,6 @@ async def handle_search(message: Message):
     # Generate a unique ID for this monitoring request
     query_id = generate_query_id()
     
-    # Initialize user_queries for this chat if not exists
-    if chat_id not in user_queries:
-        user_queries[chat_id] = {}
-    
     # Store the query information
     user_queries[chat_id][query_id] = {
         'query': query, 
@@ -1578,19 +1621,19 @@ async def handle_search(message: Message):
     }
     
     # Ask for filter mode
-    logger.info(f"Showing filter keyboard to user {user_id} for coin {query}")
+    logger.info("Showing filter keyboard to user %s for coin %s", user_id, query)
     await message.answer(
         f"Please select which opportunities to monitor for {query}:",
         reply_markup=get_filter_mode_keyboard()
     )
     return
 
-@router.message(lambda message: message.chat.id in user_queries)
+# F.text first so media updates are rejected before the membership check and
+# never reach message.text.strip(); in_() reads the live user_queries dict
+@router.message(F.text & ~F.text.startswith('/') & F.chat.id.in_(user_queries))
 async def handle_min_percentage(message: Message):
     user_id = message.from_user.id
     chat_id = message.chat.id
-    alert_group_id = int(os.getenv("ALERT_GROUP_ID"))
-    topic_id = int(os.getenv("TOPIC_ID", "1"))
     bot = message.bot
     
     # Get the stored query
@@ -1599,98 +1642,65 @@ async def handle_min_percentage(message: Message):
     
     # Get the user's filter preference (default to "all" if not set)
     filter_mode = query_info.get('filter_mode', "all")
-    logger.info(f"Using filter mode: {filter_mode} for query {query_info['query']} (ID: {query_id})")
-    
     # Parse the minimum percentage
-    try:
-        min_percentage = float(message.text.strip())
-        if min_percentage <= 0:
-            await message.answer("Minimum percentage must be greater than 0. Please try again.")
-            return
-    except ValueError:
+    match = _PCT_RE.match(message.text)
+    if not match:
         await message.answer("Please enter a valid number (e.g., 0.5 for 0.5%)")
         return
+    min_percentage = float(match.group(1))
+    if min_percentage <= 0:
+        await message.answer("Minimum percentage must be greater than 0. Please try again.")
+        return
     
     try:
-        # Cancel existing monitoring task if any
-        if chat_id in active_monitors:
-            for query_id, task in active_monitors[chat_id].items():
-                task.cancel()
-            del active_monitors[chat_id]
-        
         # Get filter mode text for display
-        if filter_mode == "cex_only":
-            mode_text = "CEX-CEX Only"
-        elif filter_mode == "cex_dex_only":
-            mode_text = "CEX-DEX Only"
-        elif filter_mode == "future":
-            mode_text = "Futures Only (DEX-CEX-F)"
-        else:
-            mode_text = "All Types"
+        mode_text = MODE_TEXT.get(filter_mode, DEFAULT_MODE_TEXT)
         
         # Store the filter mode for future reference
         # This helps ensure the filter mode is preserved
-        if chat_id not in user_filter_preferences:
-            user_filter_preferences[chat_id] = {}
         user_filter_preferences[chat_id] = filter_mode
         
-        logger.info(f"Setting filter mode to {filter_mode} for query {query_info['query']} (ID: {query_id})")
-        
-        try:
-            # Translate filter mode for display
-            if filter_mode == "dex_only":
-                mode_text = "DEX Only"
-            elif filter_mode == "cex_only":
-                mode_text = "CEX-CEX Only"
-            elif filter_mode == "cex_dex_only":
-                mode_text = "CEX-DEX Only"
-            elif filter_mode == "future":
-                mode_text = "Futures Only (DEX-CEX-F)"
-            else:
-                mode_text = "All Types"
-        except Exception as e:
-            logger.error(f"Error translating filter mode: {str(e)}")
-        
-        # Send initial message to alert group
-        await bot.send_message(
-            chat_id=alert_group_id,
-            text=f"🔍 Starting price monitoring for {query_info['query']} with minimum arbitrage of {min_percentage}%...\nFilter mode: {mode_text}",
-            message_thread_id=topic_id,
-            parse_mode="HTML",
-            disable_web_page_preview=True
-        )
+        logger.info("Setting filter mode to %s for query %s (ID: %s)", filter_mode, query_info['query'], query_id)
         
-        # Start new monitoring task with the target chat ID, bot instance, minimum percentage, and filter mode
-        task = asyncio.create_task(monitor_prices(
-            chat_id, 
-            query_info['query'], 
-            bot, 
-            min_percentage, 
-            query_info.get('network'), 
-            query_info.get('pool_address'), 
-            query_id,
-            query_info.get('filter_mode'),  # Pass the filter_mode
-            query_info.get('enforce_deposit_withdrawal_checks', False)  # Pass the deposit check setting
-        ))
-        active_monitors[chat_id] = {query_id: task}
-        
-        # Send confirmation to both alert group and admin
-        await bot.send_message(
-            chat_id=alert_group_id,
-            text=f"✅ Monitoring started for {query_info['query']}!\n\n"
-                 f"Filter mode: {mode_text}\n"
-                 f"I will notify you when there are arbitrage opportunities with >{min_percentage}% difference.\n"
-                 "Use /stop command to stop monitoring.",
-            message_thread_id=topic_id,
-            parse_mode="HTML",
-            disable_web_page_preview=True
+        # Replace the chat's monitors under its lock so a concurrent start can't
+        # slip a task in between the cancel and the new registration
+        async with _monitor_service.chat_locks[chat_id]:
+            # Cancel existing monitoring tasks and let them shut down before starting the new one
+            await _monitor_service.cancel_tasks(active_monitors.pop(chat_id, {}).values())
+            
+            # Start new monitoring task with the target chat ID, bot instance, minimum percentage, and filter mode
+            task = asyncio.create_task(monitor_prices(
+                chat_id, 
+                query_info['query'], 
+                bot, 
+                min_percentage, 
+                query_info.get('network'), 
+                query_info.get('pool_address'), 
+                query_id,
+                query_info.get('filter_mode'),  # Pass the filter_mode
+                query_info.get('enforce_deposit_withdrawal_checks', False)  # Pass the deposit check setting
+            ))
+            _monitor_service.track_monitor(chat_id, query_id, task)
+        
+        # Send confirmation to both alert group and admin; the chats differ, so
+        # the two requests don't need to be ordered
+        await asyncio.gather(
+            bot.send_message(
+                chat_id=ALERT_GROUP_ID,
+                text=f"✅ Monitoring started for {query_info['query']}!\n\n"
+                     f"Filter mode: {mode_text}\n"
+                     f"I will notify you when there are arbitrage opportunities with >{min_percentage}% difference.\n"
+                     "Use /stop command to stop monitoring.",
+                message_thread_id=TOPIC_ID,
+                parse_mode="HTML",
+                disable_web_page_preview=True
+            ),
+            message.answer(f"✅ Started monitoring {query_info['query']} with minimum arbitrage set to {min_percentage}%\nFilter mode: {mode_text}")
         )
-        
-        await message.answer(f"✅ Started monitoring {query_info['query']} with minimum arbitrage set to {min_percentage}%\nFilter mode: {mode_text}")
     except Exception as e:
         await message.answer(f"❌ Error starting monitoring: {str(e)}")
 
-def get_filter_mode_keyboard() -> InlineKeyboardMarkup:
+def _build_filter_mode_keyboard() -> InlineKeyboardMarkup:
     """Create a keyboard for selecting filter mode"""
     builder = InlineKeyboardBuilder()
     
@@ -1717,14 +1727,26 @@ def get_filter_mode_keyboard() -> InlineKeyboardMarkup:
     builder.adjust(1)
     return builder.as_markup()
 
-@router.callback_query(F.data.startswith("filter_"))
+_FILTER_MODE_KEYBOARD = _build_filter_mode_keyboard()
+
+def get_filter_mode_keyboard() -> InlineKeyboardMarkup:
+    """Keyboard for selecting filter mode, built once at import (do not modify)"""
+    return _FILTER_MODE_KEYBOARD
+
+# callback_data -> (filter mode, display text), one entry per get_filter_mode_keyboard button
+_FILTER_FROM_CB = {
+    "filter_cex_only": ("cex_only", MODE_TEXT["cex_only"]),
+    "filter_cex_dex_only": ("cex_dex_only", MODE_TEXT["cex_dex_only"]),
+    "filter_future": ("future", MODE_TEXT["future"]),
+    "filter_all": ("all", DEFAULT_MODE_TEXT),
+}
+
+@router.callback_query(F.data.in_(_FILTER_FROM_CB))
 async def handle_filter_mode_callback(callback: CallbackQuery):
     """Handle filter mode selection"""
-    filter_mode = callback.data.split("_")[1]
+    filter_mode, mode_text = _FILTER_FROM_CB[callback.data]
     user_id = callback.from_user.id
     chat_id = callback.message.chat.id
-    alert_group_id = int(os.getenv("ALERT_GROUP_ID"))
-    topic_id = int(os.getenv("TOPIC_ID", "0"))  # Get topic ID from env
     bot = callback.bot
     
     # Check if user is admin
@@ -1733,46 +1755,24 @@ async def handle_filter_mode_callback(callback: CallbackQuery):
         return
     
     # Find the most recent query in user_queries for this chat
-    if chat_id not in user_queries or not user_queries[chat_id]:
+    chat_queries = user_queries.get(chat_id)
+    if not chat_queries:
         await callback.answer("❌ No pending coin to monitor. Use /addcoin to add a coin.")
         return
     
     # Get the most recent query_id added (assuming it's the one the user is configuring)
-    query_id = list(user_queries[chat_id].keys())[-1]
-    query_info = user_queries[chat_id][query_id]
+    query_id = next(reversed(chat_queries))
+    query_info = chat_queries[query_id]
     
     # Update filter mode in user_queries
     query_info['filter_mode'] = filter_mode
     
     # Store the filter mode for future reference
-    if chat_id not in user_filter_preferences:
-        user_filter_preferences[chat_id] = {}
     user_filter_preferences[chat_id] = filter_mode
     
-    logger.info(f"Setting filter mode to {filter_mode} for query {query_info['query']} (ID: {query_id})")
+    logger.info("Setting filter mode to %s for query %s (ID: %s)", filter_mode, query_info['query'], query_id)
     
     try:
-        # Translate filter mode for display
-        if filter_mode == "dex_only":
-            mode_text = "DEX Only"
-        elif filter_mode == "cex_only":
-            mode_text = "CEX-CEX Only"
-        elif filter_mode == "cex_dex_only":
-            mode_text = "CEX-DEX Only"
-        elif filter_mode == "future":
-            mode_text = "Futures Only (DEX-CEX-F)"
-        else:
-            mode_text = "All Types"
-        
-        # Send initial message to alert group
-        await bot.send_message(
-            chat_id=alert_group_id,
-            text=f"🔍 Starting price monitoring for {query_info['query']} (ID: {query_id[:8]}) with minimum arbitrage of {query_info['min_percentage']}%...\nFilter mode: {mode_text}",
-            message_thread_id=topic_id,
-            parse_mode="HTML",
-            disable_web_page_preview=True
-        )
-        
         # Start new monitoring task
         task = asyncio.create_task(
             monitor_prices(
@@ -1788,26 +1788,23 @@ async def handle_filter_mode_callback(callback: CallbackQuery):
             )
         )
         
-        # Initialize active_monitors for this chat if not exists
-        if chat_id not in active_monitors:
-            active_monitors[chat_id] = {}
-            
         # Add the new monitor to the active monitors
-        active_monitors[chat_id][query_id] = task
-        
-        # Send confirmation to both alert group and admin
-        await bot.send_message(
-            chat_id=alert_group_id,
-            text=f"✅ Monitoring started for {query_info['query']} (ID: {query_id[:8]})!\n\n"
-                 f"Filter mode: {mode_text}\n"
-                 f"I will notify you when there are arbitrage opportunities with >{query_info['min_percentage']}% difference.\n"
-                 "Use /stop command to stop monitoring.",
-            message_thread_id=topic_id,
-            parse_mode="HTML",
-            disable_web_page_preview=True
+        _monitor_service.track_monitor(chat_id, query_id, task)
+        
+        # Send confirmation to both alert group and admin at the same time
+        await asyncio.gather(
+            bot.send_message(
+                chat_id=ALERT_GROUP_ID,
+                text=f"✅ Monitoring started for {query_info['query']} (ID: {query_id[:8]})!\n\n"
+                     f"Filter mode: {mode_text}\n"
+                     f"I will notify you when there are arbitrage opportunities with >{query_info['min_percentage']}% difference.\n"
+                     "Use /stop command to stop monitoring.",
+                message_thread_id=TOPIC_ID,
+                parse_mode="HTML",
+                disable_web_page_preview=True
+            ),
+            callback.message.answer(f"✅ Started monitoring {query_info['query']} (ID: {query_id[:8]}) with minimum arbitrage set to {query_info['min_percentage']}%\nFilter mode: {mode_text}")
         )
-        
-        await callback.message.answer(f"✅ Started monitoring {query_info['query']} (ID: {query_id[:8]}) with minimum arbitrage set to {query_info['min_percentage']}%\nFilter mode: {mode_text}")
     except Exception as e:
         await callback.answer(f"❌ Error starting monitoring: {str(e)}")
 
@@ -1825,7 +1822,7 @@ async def cmd_add_coin(message: Message):
         return
     
     # Parse coin symbol from command
-    args = message.text.split()
+    args = message.text.split(maxsplit=2)
     if len(args) < 2:
         await message.answer("⚠️ Please specify a coin to monitor.\nExample: /addcoin BTC")
         return
@@ -1840,10 +1837,6 @@ async def cmd_add_coin(message: Message):
     # Generate a unique ID for this monitoring request
     query_id = generate_query_id()
     
-    # Initialize user_queries for this chat if not exists
-    if chat_id not in user_queries:
-        user_queries[chat_id] = {}
-    
     # Store the query information
     user_queries[chat_id][query_id] = {
         'query': query, 
@@ -1853,7 +1846,7 @@ async def cmd_add_coin(message: Message):
     }
     
     # Ask for filter mode
-    logger.info(f"Showing filter keyboard to user {user_id} for coin {query}")
+    logger.info("Showing filter keyboard to user %s for coin %s", user_id, query)
     await message.answer(
         f"Please select which opportunities to monitor for {query}:",
         reply_markup=get_filter_mode_keyboard()
@@ -1873,38 +1866,27 @@ async def cmd_list_coins(message: Message):
             await message.answer("❌ Only admins can view monitored coins")
         return
     
-    if chat_id not in active_monitors or not active_monitors[chat_id]:
+    monitors = active_monitors.get(chat_id)
+    if not monitors:
         await message.answer("⚠️ No coins are currently being monitored")
         return
     
     # Collect information about active monitors
     monitors_info = []
-    coin_count = len(active_monitors[chat_id])
+    coin_count = len(monitors)
+    
+    # Query IDs are unique across chats, so index them once instead of scanning every chat per monitor
+    qid_index = {qid: info for chat_data in user_queries.values() for qid, info in chat_data.items()}
     
-    for query_id, _ in active_monitors[chat_id].items():
+    for query_id in monitors:
         # Find the associated query information if available
-        query_info = "Unknown"
-        filter_mode = "all"
-        min_percentage = MIN_ARBITRAGE_PERCENTAGE
-        
-        for chat_data in user_queries.values():
-            if query_id in chat_data:
-                query_info = chat_data[query_id].get('query', 'Unknown')
-                filter_mode = chat_data[query_id].get('filter_mode', 'all')
-                min_percentage = chat_data[query_id].get('min_percentage', MIN_ARBITRAGE_PERCENTAGE)
-                break
+        info = qid_index.get(query_id, {})
+        query_info = info.get('query', 'Unknown')
+        filter_mode = info.get('filter_mode', 'all')
+        min_percentage = info.get('min_percentage', MIN_ARBITRAGE_PERCENTAGE)
         
         # Format the filter mode for display
-        if filter_mode == "dex_only":
-            mode_text = "DEX Only"
-        elif filter_mode == "cex_only":
-            mode_text = "CEX-CEX Only"
-        elif filter_mode == "cex_dex_only":
-            mode_text = "CEX-DEX Only"
-        elif filter_mode == "future":
-            mode_text = "Futures Only (DEX-CEX-F)"
-        else:
-            mode_text = "All Types"
+        mode_text = MODE_TEXT.get(filter_mode, DEFAULT_MODE_TEXT)
         
         monitors_info.append(f"• {query_info} (ID: {query_id[:8]})\n  - {mode_text}\n  - Min: {min_percentage}%")
     
@@ -1929,7 +1911,7 @@ async def cmd_set_min_percentage(message: Message):
         return
     
     # Parse arguments: /setmin <monitor_id> <percentage>
-    args = message.text.split()
+    args = message.text.split(maxsplit=3)
     if len(args) < 3:
         await message.answer("⚠️ Please specify a monitor ID and percentage.\nExample: /setmin abc123 0.5")
         return
@@ -1944,77 +1926,71 @@ async def cmd_set_min_percentage(message: Message):
         await message.answer("❌ Invalid percentage value. Please enter a valid number")
         return
     
-    if chat_id not in active_monitors or not active_monitors[chat_id]:
+    monitors = active_monitors.get(chat_id)
+    if not monitors:
         await message.answer("❌ No active monitors found")
         return
     
-    # Find the monitor by ID
-    found = False
-    for query_id, task in list(active_monitors[chat_id].items()):
-        if query_id.startswith(monitor_id):
-            # Cancel the current task
-            task.cancel()
-            
-            # Find the associated query information
-            query_info = None
-            for chat_data in user_queries.values():
-                if query_id in chat_data:
-                    query_info = chat_data[query_id]
-                    # Update the minimum percentage
-                    query_info['min_percentage'] = min_percentage
-                    break
-            
-            if not query_info:
-                # If we can't find the query info, recreate it with default values
-                query_info = {
-                    'query': f"Unknown_{query_id[:8]}",
-                    'min_percentage': min_percentage,
-                    'filter_mode': "all",
-                    'query_id': query_id
-                }
-                
-                if chat_id not in user_queries:
-                    user_queries[chat_id] = {}
-                user_queries[chat_id][query_id] = query_info
-            
-            # Restart the monitor with the new minimum percentage
-            alert_group_id = int(os.getenv("ALERT_GROUP_ID"))
-            topic_id = int(os.getenv("TOPIC_ID", "0"))
-            
-            # Start new monitoring task
-            task = asyncio.create_task(
-                monitor_prices(
-                    chat_id, 
-                    query_info['query'], 
-                    message.bot, 
-                    min_percentage, 
-                    query_info.get('network'), 
-                    query_info.get('pool_address'), 
-                    query_id,
-                    query_info.get('filter_mode'),
-                    query_info.get('enforce_deposit_withdrawal_checks', False)
-                )
-            )
-            
-            # Update the active monitor
-            active_monitors[chat_id][query_id] = task
-            
-            # Send confirmation
-            await message.answer(f"✅ Updated minimum arbitrage for {query_info['query']} (ID: {query_id[:8]}) to {min_percentage}%")
-            
-            # Notify alert group
-            await message.bot.send_message(
-                chat_id=alert_group_id, 
-                text=f"⚙️ Updated minimum arbitrage for {query_info['query']} (ID: {query_id[:8]}) to {min_percentage}%", 
-                message_thread_id=topic_id, 
-                parse_mode="HTML", 
-                disable_web_page_preview=True
-            )
-            
-            found = True
-            break
-    
-    if not found:
+    # Find the monitor by its short ID
+    found = _monitor_service.find_monitor(monitor_id, chat_id)
+    if found is None:
         await message.answer(f"❌ No monitor found with ID: {monitor_id}")
         # List available monitors to help the user
-        await cmd_list_coins(message) 
\ No newline at end of file
+        await cmd_list_coins(message)
+        return
+    _, query_id, task = found
+    
+    # Cancel the current task and wait for it to stop
+    await _monitor_service.cancel_tasks([task])
+    
+    # Find the associated query information
+    query_info = None
+    for chat_data in user_queries.values():
+        if query_id in chat_data:
+            query_info = chat_data[query_id]
+            # Update the minimum percentage
+            query_info['min_percentage'] = min_percentage
+            break
+    
+    if not query_info:
+        # If we can't find the query info, recreate it with default values
+        query_info = {
+            'query': f"Unknown_{query_id[:8]}",
+            'min_percentage': min_percentage,
+            'filter_mode': "all",
+            'query_id': query_id
+        }
+    
+        user_queries[chat_id][query_id] = query_info
+    
+    # Restart the monitor with the new minimum percentage
+    
+    # Start new monitoring task
+    task = asyncio.create_task(
+        monitor_prices(
+            chat_id, 
+            query_info['query'], 
+            message.bot, 
+            min_percentage, 
+            query_info.get('network'), 
+            query_info.get('pool_address'), 
+            query_id,
+            query_info.get('filter_mode'),
+            query_info.get('enforce_deposit_withdrawal_checks', False)
+        )
+    )
+    
+    # Update the active monitor
+    _monitor_service.track_monitor(chat_id, query_id, task)
+    
+    # Send confirmation
+    await message.answer(f"✅ Updated minimum arbitrage for {query_info['query']} (ID: {query_id[:8]}) to {min_percentage}%")
+    
+    # Notify alert group
+    await message.bot.send_message(
+        chat_id=ALERT_GROUP_ID, 
+        text=f"⚙️ Updated minimum arbitrage for {query_info['query']} (ID: {query_id[:8]}) to {min_percentage}%", 
+        message_thread_id=TOPIC_ID, 
+        parse_mode="HTML", 
+        disable_web_page_preview=True
+    )
@@ -0,0 +1,34 @@
+from typing import AbstractSet, Any, Awaitable, Callable, Dict
+from aiogram import BaseMiddleware
+from aiogram.types import CallbackQuery, Message, TelegramObject
+import logging
+
+logger = logging.getLogger(__name__)
+
+NO_PERMISSION_MSG = "⚠️ You don't have permission to use this command."
+
+class AdminOnlyMiddleware(BaseMiddleware):
+    """
+    Reject updates from non-admin users before the handler runs.
+    Register it as an inner middleware so it only sees updates a handler matched.
+    """
+    def __init__(self, admin_ids: Callable[[], AbstractSet[int]]):
+        # Called per update so a refreshed admin list takes effect without re-registering
+        self.admin_ids = admin_ids
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any]
+    ) -> Any:
+        user = getattr(event, "from_user", None)
+        if user is not None and user.id in self.admin_ids():
+            return await handler(event, data)
+
+        logger.warning("Rejected %s from non-admin user %s", type(event).__name__, user and user.id)
+        if isinstance(event, CallbackQuery):
+            await event.answer(NO_PERMISSION_MSG, show_alert=True)
+        elif isinstance(event, Message):
+            await event.answer(NO_PERMISSION_MSG)
+        return None
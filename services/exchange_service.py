@@ -12,11 +12,15 @@ from exchanges.bybit.coin_service import BybitCoinService
 from exchanges.bingx.coin_service import BingxCoinService
 from exchanges.binance.coin_service import BinanceCoinService
 from config.config_manager import ConfigManager
+import asyncio
 import aiohttp
 import logging
 from exchanges.base_client import BaseAPIClient
 logger = logging.getLogger(__name__)
 
+# Cap on in-flight price requests per exchange, shared by all monitors
+MAX_CONCURRENT_REQUESTS_PER_EXCHANGE = 10
+
 class ExchangeService:
     def __init__(self):
         # Initialize all clients and services
@@ -34,6 +38,10 @@ class ExchangeService:
             'bingx': (BingxClient(**bingx_credentials), BingxCoinService()),
             'binance': (BinanceClient(**binance_credentials), BinanceCoinService())
         }
+        self.semaphores = {
+            exchange: asyncio.Semaphore(MAX_CONCURRENT_REQUESTS_PER_EXCHANGE)
+            for exchange in self.clients
+        }
         self._session = None
 
     @property
@@ -57,10 +65,11 @@ class ExchangeService:
         try:
             exchange_client = self._get_exchange_client(exchange)
             
-            if market_type == "futures":
-                ticker = await exchange_client.get_futures_price(symbol)
-            else:
-                ticker = await exchange_client.get_spot_price(symbol)
+            async with self.semaphores[exchange.lower()]:
+                if market_type == "futures":
+                    ticker = await exchange_client.get_futures_price(symbol)
+                else:
+                    ticker = await exchange_client.get_spot_price(symbol)
             return ticker
             
         except Exception as e:
@@ -68,6 +77,13 @@ class ExchangeService:
             return None
 
     async def close(self):
+        for exchange, (client, _) in self.clients.items():
+            try:
+                await client.close()
+            except Exception as e:
+                logger.error(f"Error closing {exchange} client session: {str(e)}")
+
         if self._session is not None:
             await self._session.close()
-            self._session = None 
+            self._session = None
+
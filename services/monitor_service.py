@@ -1,3 +1,27 @@
+import asyncio
+import logging
+import secrets
+from collections import defaultdict
+
+logger = logging.getLogger(__name__)
+
+# Seconds to wait for cancelled monitors to unwind before giving up on them
+CANCEL_TIMEOUT = 10
+
+# Length of the monitor IDs shown to users; new query IDs are exactly this long
+SHORT_ID_LEN = 8
+
+# Display text per filter mode, shared by every command that shows one;
+# anything else (normally "all") is shown as DEFAULT_MODE_TEXT
+MODE_TEXT = {
+    "dex_only": "DEX Only",
+    "cex_only": "CEX-CEX Only",
+    "cex_dex_only": "CEX-DEX Only",
+    "future": "Futures Only (DEX-CEX-F)",
+}
+DEFAULT_MODE_TEXT = "All Types"
+
+
 class MonitorService:
     """
     Service for managing shared state across the application.
@@ -6,40 +30,114 @@ class MonitorService:
     - user_queries: storing temporary user queries
     - user_filter_preferences: storing user filter preferences
     """
+    __slots__ = ("active_monitors", "user_queries", "user_filter_preferences", "chat_locks",
+                 "monitor_prefix_index")
     
     def __init__(self):
         # Format: {chat_id: {query_id: task}}
-        self.active_monitors = {}
+        self.active_monitors = defaultdict(dict)
         
         # Format: {chat_id: {query_id: {query: str, min_percentage: float, filter_mode: str}}}
-        self.user_queries = {}
+        self.user_queries = defaultdict(dict)
         
         # Format: {chat_id: "cex_only" or "all"}
         self.user_filter_preferences = {}
         
-    def parse_filter_mode(self, callback_data: str) -> str:
-        """
-        Parse filter mode from callback data
+        # Format: {chat_id: asyncio.Lock}, serializes replacing a chat's monitors
+        self.chat_locks = defaultdict(asyncio.Lock)
+        
+        # Format: {query_id[:SHORT_ID_LEN]: (chat_id, query_id)}, the IDs users type into /stop and /setmin
+        self.monitor_prefix_index = {}
         
+    def new_query_id(self) -> str:
+        """
+        Generate a random query ID that users can type in full.
+
+        Returns:
+            SHORT_ID_LEN hex characters, not used by any active monitor
+        """
+        while True:
+            query_id = secrets.token_hex(SHORT_ID_LEN // 2)
+            # Only 32 bits, so make sure the prefix index never gets overwritten
+            if query_id not in self.monitor_prefix_index:
+                return query_id
+
+    @staticmethod
+    async def cancel_tasks(tasks, timeout: float = CANCEL_TIMEOUT) -> None:
+        """
+        Cancel monitor tasks and wait for them to finish unwinding, so their
+        sessions and pending requests are released before replacements start.
+
         Args:
-            callback_data: Callback data from the keyboard button (e.g., filter_cex, filter_all)
-            
+            tasks: Iterable of asyncio tasks to cancel
+            timeout: Seconds to wait before leaving stragglers to finish on their own
+        """
+        pending = [task for task in tasks if not task.done()]
+        if not pending:
+            return
+        for task in pending:
+            task.cancel()
+        # return_exceptions consumes each task's CancelledError or failure, so
+        # nothing is left to be reported as "exception was never retrieved"
+        gathered = asyncio.gather(*pending, return_exceptions=True)
+        try:
+            # Shielded so a timeout only stops waiting; without it wait_for would
+            # cancel the gather and then block on the very tasks that ignore cancellation
+            await asyncio.wait_for(asyncio.shield(gathered), timeout)
+        except asyncio.TimeoutError:
+            logger.warning("%d cancelled monitor task(s) still running after %ss", 
+                           sum(not task.done() for task in pending), timeout)
+
+    def track_monitor(self, chat_id, query_id, task) -> None:
+        """
+        Register a monitor task under active_monitors[chat_id][query_id].
+        The entry removes itself when the task finishes, unless it has been replaced.
+        """
+        self.active_monitors[chat_id][query_id] = task
+        self.monitor_prefix_index[query_id[:SHORT_ID_LEN]] = (chat_id, query_id)
+        task.add_done_callback(lambda t: self._forget_monitor(chat_id, query_id, t))
+
+    def _forget_monitor(self, chat_id, query_id, task) -> None:
+        monitors = self.active_monitors.get(chat_id)
+        if monitors is not None and monitors.get(query_id) is task:
+            del monitors[query_id]
+        # Monitors are always cancelled after being removed, so this also cleans
+        # up the index for monitors that were stopped rather than finished
+        if (query_id not in self.active_monitors.get(chat_id, ())
+                and self.monitor_prefix_index.get(query_id[:SHORT_ID_LEN]) == (chat_id, query_id)):
+            del self.monitor_prefix_index[query_id[:SHORT_ID_LEN]]
+
+    def find_monitor(self, monitor_id_prefix: str, chat_id=None):
+        """
+        Find an active monitor by the start of its query ID.
+
+        Args:
+            monitor_id_prefix: Start of the query ID, usually the short ID shown to users
+            chat_id: Only match monitors of this chat, or None for any chat
+
         Returns:
-            filter_mode: Mode used in the application ("cex_only", "cex_dex_only", "future", "all")
+            (chat_id, query_id, task) of the first match, or None
         """
-        # Strip "filter_" prefix from callback data
-        mode = callback_data.replace("filter_", "")
+        if len(monitor_id_prefix) >= SHORT_ID_LEN:
+            # Short IDs are unique enough to be looked up directly
+            entry = self.monitor_prefix_index.get(monitor_id_prefix[:SHORT_ID_LEN])
+            if entry is None:
+                return None
+            found_chat_id, query_id = entry
+            task = self.active_monitors.get(found_chat_id, {}).get(query_id)
+            if (task is None or not query_id.startswith(monitor_id_prefix)
+                    or (chat_id is not None and found_chat_id != chat_id)):
+                return None
+            return found_chat_id, query_id, task
         
-        # Map callback mode to application mode
-        if mode == "cex":
-            return "cex_only"
-        elif mode == "cex_dex_only":
-            return "cex_dex_only"
-        elif mode == "future":
-            return "future"
-        else:
-            return "all"
-            
+        # Shorter prefixes can match several monitors, so scan for the first one
+        chats = [(chat_id, self.active_monitors.get(chat_id, {}))] if chat_id is not None else self.active_monitors.items()
+        for found_chat_id, monitors in chats:
+            for query_id, task in monitors.items():
+                if query_id.startswith(monitor_id_prefix):
+                    return found_chat_id, query_id, task
+        return None
+
     async def start_monitoring(self, user_id, query, bot, min_percentage, filter_mode, network=None, pool_address=None, query_id=None, enforce_deposit_withdrawal_checks=False):
         """
         Start monitoring a crypto asset for arbitrage opportunities
@@ -58,21 +156,12 @@ class MonitorService:
         Returns:
             dict: Result with success status and monitoring details
         """
-        import asyncio
-        import uuid
-        import logging
-        
-        logger = logging.getLogger(__name__)
-        
         try:
             # Generate query ID if not provided
             if not query_id:
-                query_id = str(uuid.uuid4())
+                query_id = self.new_query_id()
                 
             # Store query information
-            if user_id not in self.user_queries:
-                self.user_queries[user_id] = {}
-                
             self.user_queries[user_id][query_id] = {
                 'query': query,
                 'min_percentage': min_percentage,
@@ -85,14 +174,6 @@ class MonitorService:
             # Store filter preference for this user
             self.user_filter_preferences[user_id] = filter_mode
             
-            # Initialize active_monitors for this user if not exists
-            if user_id not in self.active_monitors:
-                self.active_monitors[user_id] = {}
-                
-            # Cancel existing task with the same ID if exists
-            if query_id in self.active_monitors[user_id]:
-                self.active_monitors[user_id][query_id].cancel()
-                
             # Import the monitor function dynamically to avoid circular imports
             from handlers.exchange_handlers import monitor_prices
             
@@ -100,23 +181,31 @@ class MonitorService:
             if not bot:
                 raise ValueError("No bot instance provided. A valid bot instance is required.")
             
-            # Start the monitoring task
-            task = asyncio.create_task(
-                monitor_prices(
-                    user_id, 
-                    query, 
-                    bot, 
-                    min_percentage, 
-                    network, 
-                    pool_address, 
-                    query_id,
-                    filter_mode,  # Explicitly pass the filter_mode
-                    enforce_deposit_withdrawal_checks  # Pass the deposit/withdrawal check parameter
+            # Hold the chat's lock across cancel and start so concurrent requests
+            # for the same chat can't both start a task for one query ID
+            async with self.chat_locks[user_id]:
+                # Cancel existing task with the same ID if exists
+                previous = self.active_monitors.get(user_id, {}).pop(query_id, None)
+                if previous is not None:
+                    await self.cancel_tasks([previous])
+                
+                # Start the monitoring task
+                task = asyncio.create_task(
+                    monitor_prices(
+                        user_id, 
+                        query, 
+                        bot, 
+                        min_percentage, 
+                        network, 
+                        pool_address, 
+                        query_id,
+                        filter_mode,  # Explicitly pass the filter_mode
+                        enforce_deposit_withdrawal_checks  # Pass the deposit/withdrawal check parameter
+                    )
                 )
-            )
-            
-            # Store the task
-            self.active_monitors[user_id][query_id] = task
+                
+                # Store the task
+                self.track_monitor(user_id, query_id, task)
             
             return {
                 "success": True,
@@ -136,38 +225,27 @@ class MonitorService:
 
     async def stop_all_monitoring(self):
         """Stop all active monitoring tasks"""
-        import logging
-        
-        logger = logging.getLogger(__name__)
         stopped_count = 0
         details = []
         
         try:
-            # Iterate through all active monitors and cancel them
-            for chat_id, monitors in list(self.active_monitors.items()):
-                for query_id, task in list(monitors.items()):
-                    if not task.done():
-                        task.cancel()
-                        stopped_count += 1
-                        
-                        # Find the associated query information if available
-                        coin_name = "Unknown"
-                        
-                        # Look through all chat_ids in user_queries to find this query_id
-                        for chat_id_inner, chat_data in self.user_queries.items():
-                            if query_id in chat_data:
-                                coin_name = chat_data[query_id].get('query', 'Unknown')
-                                # Clean up from user_queries as well
-                                del chat_data[query_id]
-                                break
-                                
-                        details.append(f"{coin_name} (ID: {query_id[:8]})")
-                
-                # Clear monitors for this chat_id
-                self.active_monitors[chat_id].clear()
+            qid_index = {qid: chat_data for chat_data in self.user_queries.values() for qid in chat_data}
+            tasks = []
+            for monitors in self.active_monitors.values():
+                for query_id, task in monitors.items():
+                    if task.done():
+                        continue
+                    tasks.append(task)
+                    
+                    # Find the associated query information if available, and drop it
+                    chat_data = qid_index.get(query_id)
+                    info = chat_data.pop(query_id) if chat_data is not None else {}
+                    details.append(f"{info.get('query', 'Unknown')} (ID: {query_id[:8]})")
             
-            # Clear our tracking completely
+            stopped_count = len(tasks)
+            # Clear our tracking completely, then cancel everything and wait for it at once
             self.active_monitors.clear()
+            await self.cancel_tasks(tasks)
             
             return {"count": stopped_count, "details": ", ".join(details) if details else "No details available"}
             
@@ -185,47 +263,41 @@ class MonitorService:
         Returns:
             dict: Result with success status and details
         """
-        import logging
-        
-        logger = logging.getLogger(__name__)
         
         try:
             # Find the monitor in all chat_ids
-            for chat_id, monitors in list(self.active_monitors.items()):
-                for query_id, task in list(monitors.items()):
-                    # Check if this query_id starts with the provided prefix
-                    if query_id.startswith(monitor_id_prefix):
-                        # Cancel the task if it's not done
-                        if not task.done():
-                            task.cancel()
-                        
-                        # Remove the task from active_monitors
-                        del self.active_monitors[chat_id][query_id]
-                        
-                        # Get the coin name if available
-                        coin_name = "Unknown"
-                        for chat_id_inner, chat_data in self.user_queries.items():
-                            if query_id in chat_data:
-                                coin_name = chat_data[query_id].get('query', 'Unknown')
-                                # Clean up from user_queries as well
-                                del chat_data[query_id]
-                                break
-                        
-                        # Clean up empty dictionaries
-                        if not self.active_monitors[chat_id]:
-                            del self.active_monitors[chat_id]
-                            
-                        return {
-                            "success": True, 
-                            "message": f"Monitoring stopped for {coin_name}",
-                            "query_id": query_id,
-                            "coin": coin_name
-                        }
+            found = self.find_monitor(monitor_id_prefix)
+            if found is None:
+                return {
+                    "success": False,
+                    "error": f"No monitor found with ID: {monitor_id_prefix}"
+                }
+            chat_id, query_id, task = found
+            
+            # Remove the task from active_monitors
+            del self.active_monitors[chat_id][query_id]
             
-            # If we get here, the monitor wasn't found
+            # Get the coin name if available, cleaning up from user_queries as well
+            coin_name = "Unknown"
+            for chat_data in self.user_queries.values():
+                info = chat_data.pop(query_id, None)
+                if info is not None:
+                    coin_name = info.get('query', 'Unknown')
+                    break
+            
+            # Clean up empty dictionaries
+            if not self.active_monitors[chat_id]:
+                del self.active_monitors[chat_id]
+            
+            # Cancel the task and wait for it to stop, now that the
+            # bookkeeping no longer depends on the state we looked up
+            await self.cancel_tasks([task])
+                
             return {
-                "success": False,
-                "error": f"No monitor found with ID: {monitor_id_prefix}"
+                "success": True, 
+                "message": f"Monitoring stopped for {coin_name}",
+                "query_id": query_id,
+                "coin": coin_name
             }
             
         except Exception as e:
@@ -237,13 +309,11 @@ class MonitorService:
 
     async def list_all_monitors(self):
         """List all active monitors"""
-        import logging
-        
-        logger = logging.getLogger(__name__)
         
         try:
             # Prepare list of monitor information
             monitors_info = []
+            qid_index = {qid: info for chat_data in self.user_queries.values() for qid, info in chat_data.items()}
             
             # Use our internal active_monitors
             # Iterate through all active monitors
@@ -254,29 +324,13 @@ class MonitorService:
                         continue
                         
                     # Find the associated query information
-                    query_info = "Unknown"
-                    filter_mode = "all"
-                    min_percentage = 0.1  # Default MIN_ARBITRAGE_PERCENTAGE
-                    
-                    # Look through all chat_ids in user_queries to find this query_id
-                    for chat_id_inner, chat_data in self.user_queries.items():
-                        if query_id in chat_data:
-                            query_info = chat_data[query_id].get('query', 'Unknown')
-                            filter_mode = chat_data[query_id].get('filter_mode', 'all')
-                            min_percentage = chat_data[query_id].get('min_percentage', 0.1)
-                            break
+                    info = qid_index.get(query_id, {})
+                    query_info = info.get('query', 'Unknown')
+                    filter_mode = info.get('filter_mode', 'all')
+                    min_percentage = info.get('min_percentage', 0.1)  # Default MIN_ARBITRAGE_PERCENTAGE
                     
                     # Format the filter mode for display
-                    if filter_mode == "dex_only":
-                        mode_text = "DEX Only"
-                    elif filter_mode == "cex_only":
-                        mode_text = "CEX-CEX Only"
-                    elif filter_mode == "cex_dex_only":
-                        mode_text = "CEX-DEX Only"
-                    elif filter_mode == "future":
-                        mode_text = "Futures Only (DEX-CEX-F)"
-                    else:
-                        mode_text = "All Types"
+                    mode_text = MODE_TEXT.get(filter_mode, DEFAULT_MODE_TEXT)
                     
                     monitors_info.append(f"• {query_info} (ID: {query_id[:8]})\n  - {mode_text}\n  - Min: {min_percentage}%")
             
@@ -0,0 +1,98 @@
+import asyncio
+import logging
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+MARKET_TYPES = ("spot", "futures")
+
+
+class PriceStreamHub:
+    """
+    WebSocket ticker feeds shared by every monitor.
+    There is one stream per exchange and market type carrying all subscribed
+    symbols, so connections stay constant as monitors are added, and monitors
+    watching the same coin read the same cached prices.
+    """
+    __slots__ = ("_get_client", "_exchanges", "_max_age", "_prices", "_subscribers", "_tasks", "_lock")
+
+    def __init__(self, get_client: Callable[[str], Any], exchanges: Iterable[str], max_age: float):
+        """
+        Args:
+            get_client: Returns the client for an exchange name; it must implement stream_tickers
+            exchanges: Exchanges to stream from
+            max_age: Seconds a pushed price stays usable
+        """
+        self._get_client = get_client
+        self._exchanges = tuple(exchanges)
+        self._max_age = max_age
+        # Format: {(exchange, market_type, symbol): (price, monotonic timestamp)}
+        self._prices: Dict[Tuple[str, str, str], Tuple[float, float]] = {}
+        # Format: {symbol: number of monitors watching it}
+        self._subscribers: Dict[str, int] = {}
+        self._tasks: List[asyncio.Task] = []
+        # Serializes stream restarts so concurrent (un)subscribes can't leak tasks
+        self._lock = asyncio.Lock()
+
+    async def subscribe(self, symbol: str) -> None:
+        """Start streaming a symbol, or share the existing stream if it is already watched"""
+        symbol = symbol.upper()
+        count = self._subscribers.get(symbol, 0)
+        self._subscribers[symbol] = count + 1
+        if count == 0:
+            await self._restart()
+
+    async def unsubscribe(self, symbol: str) -> None:
+        """Release a subscription; the symbol is dropped from the streams once nobody watches it"""
+        symbol = symbol.upper()
+        count = self._subscribers.get(symbol, 0)
+        if count > 1:
+            self._subscribers[symbol] = count - 1
+            return
+        if self._subscribers.pop(symbol, None) is None:
+            return
+        for key in [key for key in self._prices if key[2] == symbol]:
+            del self._prices[key]
+        await self._restart()
+
+    def get_price(self, exchange: str, market_type: str, symbol: str) -> Optional[float]:
+        """Return the last pushed price if it is recent enough to trust"""
+        entry = self._prices.get((exchange, market_type, symbol.upper()))
+        if entry is None:
+            return None
+        price, received_at = entry
+        if time.monotonic() - received_at > self._max_age:
+            return None
+        return price
+
+    async def close(self) -> None:
+        """Stop all streams and wait for their connections to close"""
+        self._subscribers.clear()
+        await self._restart()
+
+    async def _restart(self) -> None:
+        # Subscriptions are sent once per connection, so a changed symbol set
+        # means reconnecting; this only happens when a coin is first watched or dropped
+        async with self._lock:
+            await self._stop_tasks()
+            symbols = sorted(self._subscribers)
+            if not symbols:
+                return
+            for exchange in self._exchanges:
+                client = self._get_client(exchange)
+                for market_type in MARKET_TYPES:
+                    def on_update(symbol: str, price: float, exchange=exchange, market_type=market_type):
+                        self._prices[(exchange, market_type, symbol)] = (price, time.monotonic())
+
+                    self._tasks.append(asyncio.create_task(
+                        client.stream_tickers(symbols, on_update, market_type=market_type)
+                    ))
+            logger.info("Streaming %d symbol(s) from %s", len(symbols), ", ".join(self._exchanges))
+
+    async def _stop_tasks(self) -> None:
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+        # Wait for the streams to unwind so their sockets are closed before new ones open
+        await asyncio.gather(*tasks, return_exceptions=True)
@@ -0,0 +1,72 @@
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+
+class SessionStore:
+    """
+    Per-user conversation state that expires after a period of inactivity.
+    Entries are kept in last-touched order, so expired ones are always at the
+    front and are evicted on each access without scanning the whole store.
+    """
+    __slots__ = ("_d", "_ttl")
+
+    def __init__(self, ttl: float):
+        """
+        Args:
+            ttl: Seconds an entry survives without being touched
+        """
+        # Format: {key: (last_touched_monotonic, value)}
+        self._d = OrderedDict()
+        self._ttl = ttl
+
+    def _evict(self, now: float) -> None:
+        d = self._d
+        while d:
+            key = next(iter(d))
+            if now - d[key][0] <= self._ttl:
+                break
+            d.popitem(last=False)
+
+    def touch(self, key: Hashable) -> Optional[Any]:
+        """
+        Get a live entry and mark it as recently used.
+
+        Args:
+            key: Session key, usually a Telegram user ID
+
+        Returns:
+            The stored value, or None if there is no entry or it expired
+        """
+        now = time.monotonic()
+        self._evict(now)
+        entry = self._d.get(key)
+        if entry is None:
+            return None
+        self._d[key] = (now, entry[1])
+        self._d.move_to_end(key)
+        return entry[1]
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """Remove an entry and return its value, or default if absent or expired"""
+        now = time.monotonic()
+        entry = self._d.pop(key, None)
+        self._evict(now)
+        if entry is None or now - entry[0] > self._ttl:
+            return default
+        return entry[1]
+
+    def __setitem__(self, key: Hashable, value: Any) -> None:
+        now = time.monotonic()
+        self._evict(now)
+        self._d[key] = (now, value)
+        self._d.move_to_end(key)
+
+    def __contains__(self, key: Hashable) -> bool:
+        # Read-only so it is safe to use from filters such as F.from_user.id.in_(store)
+        entry = self._d.get(key)
+        return entry is not None and time.monotonic() - entry[0] <= self._ttl
+
+    def __len__(self) -> int:
+        self._evict(time.monotonic())
+        return len(self._d)
@@ -0,0 +1,59 @@
+from exchanges.mexc.coin_service import MexcCoinService
+from exchanges.mexc.models import COINS_DECODER
+
+# Trimmed /api/v3/capital/config/getall response, as documented by MEXC
+GETALL_PAYLOAD = b"""[
+  {
+    "coin": "EOS",
+    "Name": "EOS",
+    "networkList": [
+      {
+        "coin": "EOS",
+        "depositDesc": null,
+        "depositEnable": true,
+        "minConfirm": 0,
+        "Name": "EOS",
+        "network": "EOS",
+        "withdrawEnable": false,
+        "withdrawFee": "0.000100000000000000",
+        "withdrawIntegerMultiple": null,
+        "withdrawMax": "10000.000000000000000000",
+        "withdrawMin": "0.001000000000000000",
+        "sameAddress": false,
+        "contract": "TN3W4H6rK2ce4vX9YnFQHwKENnHjoxb3m9",
+        "withdrawTips": null,
+        "depositTips": null,
+        "netWork": "EOS"
+      }
+    ]
+  },
+  {
+    "coin": "USDT",
+    "Name": "TetherUS",
+    "networkList": []
+  }
+]"""
+
+
+def test_decode_maps_capitalized_name():
+    coins = COINS_DECODER.decode(GETALL_PAYLOAD)
+
+    assert [coin.coin for coin in coins] == ["EOS", "USDT"]
+    assert coins[1].name == "TetherUS"
+
+
+def test_decode_network_fields():
+    network = COINS_DECODER.decode(GETALL_PAYLOAD)[0].networkList[0]
+
+    assert network.coin == "EOS"
+    assert network.network == "EOS"
+    assert network.depositEnable is True
+    assert network.withdrawEnable is False
+    assert network.contract == "TN3W4H6rK2ce4vX9YnFQHwKENnHjoxb3m9"
+
+
+def test_search_by_full_name():
+    coins = COINS_DECODER.decode(GETALL_PAYLOAD)
+    service = MexcCoinService()
+
+    assert service.search_by_name(coins, "TetherUS").coin == "USDT"
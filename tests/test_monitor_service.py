@@ -0,0 +1,109 @@
+import asyncio
+import logging
+
+from services import monitor_service
+from services.monitor_service import MonitorService
+
+
+async def idle():
+    await asyncio.Event().wait()
+
+
+def test_find_monitor_by_short_id_and_prefix():
+    async def scenario():
+        service = MonitorService()
+        task = asyncio.create_task(idle())
+        service.track_monitor(1, "abcd1234", task)
+
+        assert service.find_monitor("abcd1234") == (1, "abcd1234", task)
+        assert service.find_monitor("abc") == (1, "abcd1234", task)
+        assert service.find_monitor("abcd1234", chat_id=2) is None
+        assert service.find_monitor("abc", chat_id=2) is None
+        assert service.find_monitor("ffff0000") is None
+        await service.cancel_tasks([task])
+
+    asyncio.run(scenario())
+
+
+def test_finished_monitor_leaves_the_index():
+    async def scenario():
+        service = MonitorService()
+        task = asyncio.create_task(idle())
+        service.track_monitor(1, "abcd1234", task)
+
+        await service.cancel_tasks([task])
+        # Done callbacks run on the next loop iteration
+        await asyncio.sleep(0)
+
+        assert service.find_monitor("abcd1234") is None
+        assert "abcd1234" not in service.monitor_prefix_index
+        assert not service.active_monitors[1]
+
+    asyncio.run(scenario())
+
+
+def test_replaced_monitor_does_not_remove_its_successor():
+    async def scenario():
+        service = MonitorService()
+        old = asyncio.create_task(idle())
+        service.track_monitor(1, "abcd1234", old)
+        new = asyncio.create_task(idle())
+        service.track_monitor(1, "abcd1234", new)
+
+        await service.cancel_tasks([old])
+        await asyncio.sleep(0)
+
+        assert service.find_monitor("abcd1234") == (1, "abcd1234", new)
+        await service.cancel_tasks([new])
+
+    asyncio.run(scenario())
+
+
+def test_new_query_id_skips_short_ids_in_use(monkeypatch):
+    service = MonitorService()
+    service.monitor_prefix_index["abcd1234"] = (1, "abcd1234")
+    drawn = iter(["abcd1234", "abcd1234", "0badf00d"])
+    monkeypatch.setattr(monitor_service.secrets, "token_hex", lambda nbytes: next(drawn))
+
+    assert service.new_query_id() == "0badf00d"
+
+
+def test_cancel_tasks_gives_up_after_timeout(caplog):
+    async def scenario():
+        release = asyncio.Event()
+
+        async def stubborn():
+            # Ignore cancellation until released, like a monitor stuck in cleanup
+            while not release.is_set():
+                try:
+                    await release.wait()
+                except asyncio.CancelledError:
+                    pass
+
+        task = asyncio.create_task(stubborn())
+        await asyncio.sleep(0)
+
+        with caplog.at_level(logging.WARNING, logger=monitor_service.logger.name):
+            await asyncio.wait_for(MonitorService.cancel_tasks([task], timeout=0.05), 1)
+
+        assert not task.done()
+        assert "still running" in caplog.text
+
+        release.set()
+        await task
+
+    asyncio.run(scenario())
+
+
+def test_cancel_tasks_skips_finished_tasks():
+    async def scenario():
+        done = asyncio.create_task(asyncio.sleep(0))
+        await done
+        running = asyncio.create_task(idle())
+
+        await MonitorService.cancel_tasks([done, running])
+
+        assert running.cancelled()
+        assert not done.cancelled()
+
+    asyncio.run(scenario())
@@ -0,0 +1,83 @@
+import asyncio
+
+from services.price_streams import PriceStreamHub
+
+
+class FakeStreamClient:
+    """Records stream_tickers calls and pushes one price per symbol"""
+    def __init__(self):
+        self.started = []
+        self.closed = 0
+
+    async def stream_tickers(self, symbols, on_update, market_type="spot"):
+        self.started.append((tuple(symbols), market_type))
+        for symbol in symbols:
+            on_update(symbol, 1.5)
+        try:
+            await asyncio.Event().wait()
+        finally:
+            self.closed += 1
+
+
+def make_hub(max_age=30):
+    client = FakeStreamClient()
+    return PriceStreamHub(lambda exchange: client, ("bitget", "gate"), max_age), client
+
+
+def test_monitors_share_one_stream_per_exchange_and_market():
+    async def scenario():
+        hub, client = make_hub()
+        await hub.subscribe("btc")
+        await hub.subscribe("BTC")
+        await asyncio.sleep(0)
+
+        assert len(client.started) == 4
+        assert hub.get_price("gate", "futures", "BTC") == 1.5
+
+        # The second monitor leaving keeps the stream running for the first
+        await hub.unsubscribe("BTC")
+        assert client.closed == 0
+        await hub.close()
+
+    asyncio.run(scenario())
+
+
+def test_new_symbol_restarts_streams_with_all_symbols():
+    async def scenario():
+        hub, client = make_hub()
+        await hub.subscribe("BTC")
+        await asyncio.sleep(0)
+        await hub.subscribe("ETH")
+        await asyncio.sleep(0)
+
+        # Old streams are awaited, not just cancelled, before new ones open
+        assert client.closed == 4
+        assert client.started[-1] == (("BTC", "ETH"), "futures")
+        await hub.close()
+
+    asyncio.run(scenario())
+
+
+def test_last_unsubscribe_stops_streams_and_drops_prices():
+    async def scenario():
+        hub, client = make_hub()
+        await hub.subscribe("BTC")
+        await asyncio.sleep(0)
+        await hub.unsubscribe("BTC")
+
+        assert client.closed == 4
+        assert hub.get_price("bitget", "spot", "BTC") is None
+
+    asyncio.run(scenario())
+
+
+def test_stale_prices_are_ignored():
+    async def scenario():
+        hub, client = make_hub(max_age=-1)
+        await hub.subscribe("BTC")
+        await asyncio.sleep(0)
+
+        assert hub.get_price("bitget", "spot", "BTC") is None
+        await hub.close()
+
+    asyncio.run(scenario())
@@ -0,0 +1,74 @@
+import pytest
+
+from services import session_store
+from services.session_store import SessionStore
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controllable replacement for time.monotonic inside session_store"""
+    now = [1000.0]
+    monkeypatch.setattr(session_store.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_entry_expires_after_ttl(clock):
+    store = SessionStore(ttl=10)
+    store[1] = "setup"
+
+    clock[0] += 10
+    assert store.touch(1) == "setup"
+
+    clock[0] += 10.5
+    assert store.touch(1) is None
+    assert 1 not in store
+
+
+def test_touch_extends_lifetime(clock):
+    store = SessionStore(ttl=10)
+    store[1] = "setup"
+
+    for _ in range(3):
+        clock[0] += 8
+        assert store.touch(1) == "setup"
+
+    assert 1 in store
+
+
+def test_expired_entries_are_evicted_oldest_first(clock):
+    store = SessionStore(ttl=10)
+    store[1] = "a"
+    clock[0] += 5
+    store[2] = "b"
+    clock[0] += 4
+    # Touching the oldest entry moves it behind the newer one
+    store.touch(1)
+
+    clock[0] += 7
+    assert len(store) == 1
+    assert 1 in store and 2 not in store
+
+    clock[0] += 10
+    assert len(store) == 0
+
+
+def test_contains_does_not_refresh(clock):
+    store = SessionStore(ttl=10)
+    store[1] = "setup"
+
+    clock[0] += 9
+    assert 1 in store
+    clock[0] += 2
+    assert 1 not in store
+
+
+def test_pop_ignores_expired_entries(clock):
+    store = SessionStore(ttl=10)
+    store[1] = "a"
+    store[2] = "b"
+
+    assert store.pop(1) == "a"
+    assert store.pop(1, "missing") == "missing"
+
+    clock[0] += 11
+    assert store.pop(2, "missing") == "missing"